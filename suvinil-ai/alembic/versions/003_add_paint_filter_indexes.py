@@ -0,0 +1,56 @@
+"""add paint filter indexes
+
+Revision ID: 003_add_paint_filter_indexes
+Revises: 002_add_chat_messages
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_add_paint_filter_indexes'
+down_revision: Union[str, None] = '002_add_chat_messages'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    if 'paints' not in inspector.get_table_names():
+        return
+
+    # Só cria os índices se a tabela já estiver no formato do modelo atual
+    columns = {c['name'] for c in inspector.get_columns('paints')}
+    existing_indexes = {i['name'] for i in inspector.get_indexes('paints')}
+
+    if {'is_active', 'ambiente', 'acabamento', 'linha'} <= columns \
+            and 'ix_paints_active_env_finish_line' not in existing_indexes:
+        op.create_index(
+            'ix_paints_active_env_finish_line',
+            'paints',
+            ['is_active', 'ambiente', 'acabamento', 'linha'],
+            unique=False,
+        )
+
+    # Índice trigram para ILIKE '%termo%' no nome (pg_trgm só existe no Postgres)
+    if connection.dialect.name != 'postgresql':
+        return
+    if 'nome' in columns and 'ix_paints_nome_trgm' not in existing_indexes:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_paints_nome_trgm',
+            'paints',
+            ['nome'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'nome': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_paints_nome_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_paints_active_env_finish_line')
@@ -0,0 +1,57 @@
+"""add paint search vector
+
+Revision ID: 004_add_paint_search_vector
+Revises: 003_add_paint_filter_indexes
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '004_add_paint_search_vector'
+down_revision: Union[str, None] = '003_add_paint_filter_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector('portuguese'::regconfig, "
+    "coalesce(nome, '') || ' ' || coalesce(cor, '') || ' ' || "
+    "coalesce(tipo_parede, '') || ' ' || coalesce(features, ''))"
+)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(connection)
+    if 'paints' not in inspector.get_table_names():
+        return
+
+    columns = {c['name'] for c in inspector.get_columns('paints')}
+    if not {'nome', 'cor', 'tipo_parede', 'features'} <= columns:
+        return
+
+    # Coluna tsvector gerada (STORED) + índice GIN para a busca textual
+    if 'search_vector' not in columns:
+        op.add_column(
+            'paints',
+            sa.Column(
+                'search_vector',
+                postgresql.TSVECTOR(),
+                sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            ),
+        )
+    op.execute('CREATE INDEX IF NOT EXISTS ix_paints_search ON paints USING gin (search_vector)')
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql':
+        return
+    op.execute('DROP INDEX IF EXISTS ix_paints_search')
+    op.execute('ALTER TABLE paints DROP COLUMN IF EXISTS search_vector')
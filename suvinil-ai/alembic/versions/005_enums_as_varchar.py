@@ -0,0 +1,65 @@
+"""store enum columns as varchar
+
+Revision ID: 005_enums_as_varchar
+Revises: 004_add_paint_search_vector
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '005_enums_as_varchar'
+down_revision: Union[str, None] = '004_add_paint_search_vector'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (tabela, coluna, tipo ENUM nativo criado pelo SQLAlchemy, valores)
+ENUM_COLUMNS = (
+    ('paints', 'ambiente', 'ambiente', ('INTERNO', 'EXTERNO', 'INTERNO_EXTERNO')),
+    ('paints', 'acabamento', 'acabamento', ('FOSCO', 'ACETINADO', 'BRILHANTE')),
+    ('paints', 'linha', 'linha', ('PREMIUM', 'STANDARD')),
+    ('users', 'role', 'userrole', ('ADMIN', 'USER')),
+)
+
+
+def _existing_columns(inspector, table):
+    if table not in inspector.get_table_names():
+        return set()
+    return {c['name'] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(connection)
+
+    # Os nomes dos membros continuam sendo o valor gravado; só muda o tipo
+    for table, column, type_name, _ in ENUM_COLUMNS:
+        if column in _existing_columns(inspector, table):
+            op.execute(
+                f'ALTER TABLE {table} ALTER COLUMN {column} '
+                f'TYPE VARCHAR(16) USING {column}::text'
+            )
+        op.execute(f'DROP TYPE IF EXISTS {type_name}')
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(connection)
+
+    for table, column, type_name, values in ENUM_COLUMNS:
+        if column not in _existing_columns(inspector, table):
+            continue
+        labels = ', '.join(f"'{v}'" for v in values)
+        op.execute(f'CREATE TYPE {type_name} AS ENUM ({labels})')
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN {column} '
+            f'TYPE {type_name} USING {column}::{type_name}'
+        )
@@ -0,0 +1,56 @@
+"""add trigram indexes for paint ILIKE columns
+
+Revision ID: 006_add_paint_trigram_indexes
+Revises: 005_enums_as_varchar
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '006_add_paint_trigram_indexes'
+down_revision: Union[str, None] = '005_enums_as_varchar'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# ix_paints_nome_trgm já é criado pela 003
+TRGM_COLUMNS = ('cor', 'tipo_parede', 'features')
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(connection)
+    if 'paints' not in inspector.get_table_names():
+        return
+
+    columns = {c['name'] for c in inspector.get_columns('paints')}
+    existing_indexes = {i['name'] for i in inspector.get_indexes('paints')}
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # CONCURRENTLY não roda dentro de transação
+    with op.get_context().autocommit_block():
+        for column in TRGM_COLUMNS:
+            index_name = f'ix_paints_{column}_trgm'
+            if column not in columns or index_name in existing_indexes:
+                continue
+            op.create_index(
+                index_name,
+                'paints',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    for column in TRGM_COLUMNS:
+        op.execute(f'DROP INDEX IF EXISTS ix_paints_{column}_trgm')
@@ -0,0 +1,71 @@
+"""add precomputed surface categories to paints
+
+Revision ID: 007_add_paint_surface_categories
+Revises: 006_add_paint_trigram_indexes
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '007_add_paint_surface_categories'
+down_revision: Union[str, None] = '006_add_paint_trigram_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mesmas palavras-chave do classificador do PaintRepository (congeladas aqui)
+SURFACE_PATTERNS = (
+    ('metal', 'metal|ferro|aço|aco|alum|inox'),
+    ('madeira', 'madeira|mdf|compens|laminad'),
+    ('parede', 'parede|alvenaria|reboco|gesso|massa|cimento'),
+)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    if 'paints' not in inspector.get_table_names():
+        return
+
+    columns = {c['name'] for c in inspector.get_columns('paints')}
+    if 'categorias_superficie' in columns or 'tipo_parede' not in columns:
+        return
+
+    op.add_column(
+        'paints',
+        sa.Column(
+            'categorias_superficie',
+            postgresql.ARRAY(sa.String(16)),
+            nullable=False,
+            server_default='{}',
+        ),
+    )
+
+    # Backfill das linhas existentes a partir de tipo_parede
+    cases = ', '.join(
+        f"CASE WHEN tipo_parede ~* '{pattern}' THEN '{category}' END"
+        for category, pattern in SURFACE_PATTERNS
+    )
+    op.execute(
+        f'UPDATE paints SET categorias_superficie = '
+        f'array_remove(ARRAY[{cases}]::varchar[], NULL)'
+    )
+    op.alter_column('paints', 'categorias_superficie', server_default=None)
+
+    op.create_index(
+        'ix_paints_categorias_superficie',
+        'paints',
+        ['categorias_superficie'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_paints_categorias_superficie')
+    op.execute('ALTER TABLE paints DROP COLUMN IF EXISTS categorias_superficie')
@@ -0,0 +1,40 @@
+"""add lower(cor) prefix index to paints
+
+Revision ID: 008_add_paint_color_prefix_index
+Revises: 007_add_paint_surface_categories
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '008_add_paint_color_prefix_index'
+down_revision: Union[str, None] = '007_add_paint_surface_categories'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(connection)
+    if 'paints' not in inspector.get_table_names():
+        return
+
+    columns = {c['name'] for c in inspector.get_columns('paints')}
+    if 'cor' not in columns:
+        return
+
+    # text_pattern_ops: permite LIKE 'prefixo%' em B-tree independente do collation
+    op.execute(
+        'CREATE INDEX IF NOT EXISTS ix_paints_cor_lower_prefix '
+        'ON paints (lower(cor) text_pattern_ops)'
+    )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_paints_cor_lower_prefix')
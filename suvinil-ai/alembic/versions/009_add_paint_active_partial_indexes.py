@@ -0,0 +1,54 @@
+"""add partial indexes on active paints
+
+Revision ID: 009_add_paint_active_partial_indexes
+Revises: 008_add_paint_color_prefix_index
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '009_add_paint_active_partial_indexes'
+down_revision: Union[str, None] = '008_add_paint_color_prefix_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PARTIAL_INDEXES = (
+    ('ix_paints_active_id', 'id'),
+    ('ix_paints_active_ambiente', 'ambiente'),
+    ('ix_paints_active_acabamento', 'acabamento'),
+)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    if connection.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(connection)
+    if 'paints' not in inspector.get_table_names():
+        return
+
+    columns = {c['name'] for c in inspector.get_columns('paints')}
+    if 'is_active' not in columns:
+        return
+    existing_indexes = {i['name'] for i in inspector.get_indexes('paints')}
+
+    # Só as linhas ativas entram no índice (soft delete fica de fora)
+    for name, column in PARTIAL_INDEXES:
+        if column in columns and name not in existing_indexes:
+            op.create_index(
+                name,
+                'paints',
+                [column],
+                unique=False,
+                postgresql_where=sa.text('is_active'),
+            )
+
+
+def downgrade() -> None:
+    for name, _ in reversed(PARTIAL_INDEXES):
+        op.execute(f'DROP INDEX IF EXISTS {name}')
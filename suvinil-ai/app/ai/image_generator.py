@@ -5,6 +5,7 @@ Gera imagens simulando a aplicação de tintas em ambientes,
 permitindo ao usuário visualizar como ficaria a cor escolhida.
 """
 
+import asyncio
 import logging
 from typing import Optional
 from openai import AsyncOpenAI
@@ -120,12 +121,26 @@ class ImageGenerator:
         logger.info(f"Gerando comparação: {color1} vs {color2} em {environment}")
         
         try:
-            # Gerar ambas as imagens em paralelo seria mais eficiente,
-            # mas por simplicidade faremos sequencial
-            image1 = await self.generate_paint_visualization(color1, environment)
-            image2 = await self.generate_paint_visualization(color2, environment)
+            # As duas chamadas ao DALL-E são independentes: rodam em paralelo
+            tasks = [
+                asyncio.create_task(self.generate_paint_visualization(color, environment))
+                for color in (color1, color2)
+            ]
+            try:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            finally:
+                # Se uma falhar (ou a comparação for cancelada), a outra não
+                # segue rodando e sendo cobrada sem que o resultado seja usado
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
             
-            return (image1, image2)
+            # Erro da primeira cor tem prioridade quando as duas falham
+            for task in tasks:
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            
+            return (tasks[0].result(), tasks[1].result())
             
         except Exception as e:
             logger.error(f"Erro ao gerar comparação: {e}")
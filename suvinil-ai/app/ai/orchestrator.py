@@ -8,7 +8,7 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from sqlalchemy.orm import Session
 
-from app.ai.rag_service import RAGService
+from app.ai.rag_service import get_rag_service
 from app.ai.specialists import get_all_specialists, SpecialistRecommendation
 from app.ai.image_generator import ImageGenerator
 <<<<<<< HEAD
@@ -35,7 +35,7 @@ class OrchestratorAgent:
     def __init__(self, db: Session, user_id: Optional[int] = None):
         self.db = db
         self.user_id = user_id
-        self.rag = RAGService(db)
+        self.rag = get_rag_service(db)
  
         self.llm = ChatOpenAI(
             model=settings.OPENAI_CHAT_MODEL,
@@ -5,7 +5,10 @@ os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
 os.environ.setdefault("CHROMA_TELEMETRY", "False")
 import logging
 import shutil
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from openai import RateLimitError
 from sqlalchemy.orm import Session
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import Chroma
@@ -20,6 +23,9 @@ class RAGService:
     COLLECTION_NAME = "suvinil_paints_v2"
     # Retrocompatibilidade com coleções antigas
     LEGACY_COLLECTION_NAME = "suvinil_paints"
+    # Após um 429 (limite/cota da OpenAI), as buscas falham localmente por este
+    # tempo em vez de repetir a requisição só para receber o mesmo erro
+    RATE_LIMIT_COOLDOWN_SECONDS = 60
 
     def __init__(self, db: Session):
         self.db = db
@@ -28,6 +34,8 @@ class RAGService:
             model=settings.OPENAI_EMBEDDING_MODEL,
         )
         self.vectorstore: Optional[Chroma] = None
+        self.last_error: Optional[Exception] = None
+        self._rate_limited_until = 0.0
         self._initialize_vectorstore()
 
     def _paint_to_document(self, paint) -> Document:
@@ -70,16 +78,19 @@ class RAGService:
         # Se não existe ou falhou, reindexar
         self.reindex()
 
-    def reindex(self) -> int:
-        """Recria o índice do zero a partir do catálogo no SQL."""
+    def reindex(self, db: Optional[Session] = None) -> int:
+        """Recria o índice do zero a partir do catálogo no SQL.
+
+        `db` permite reindexar a instância compartilhada com a sessão da
+        requisição atual (a sessão da criação pode já estar fechada).
+        """
         logger.info("Reindexando banco de vetores (Chroma)...")
-        paints = PaintRepository.get_all(self.db, skip=0, limit=2000)
-        if not paints:
+        # Catálogo percorrido em lotes; só os Documents ficam em memória
+        documents = [self._paint_to_document(p) for p in PaintRepository.get_all_stream(db or self.db)]
+        if not documents:
             self.vectorstore = None
             return 0
 
-        documents = [self._paint_to_document(p) for p in paints]
-
         if os.path.exists(self.PERSIST_DIRECTORY):
             shutil.rmtree(self.PERSIST_DIRECTORY, ignore_errors=True)
 
@@ -91,19 +102,44 @@ class RAGService:
         )
         return len(documents)
 
-    def search_paints(self, query: str, k: int = 3, filters: Dict = None) -> List[Dict]:
-        if not self.vectorstore: return []
-        
+    @staticmethod
+    def _where_clause(filters: Optional[Dict]) -> Optional[Dict]:
         conditions = []
         if filters:
             if filters.get("ambiente"): conditions.append({"ambiente": filters["ambiente"].lower()})
             if filters.get("cor"): conditions.append({"cor": filters["cor"].lower()})
             if filters.get("tipo_parede"): conditions.append({"tipo_parede": filters["tipo_parede"].lower()})
 
-        where_clause = {"$and": conditions} if len(conditions) > 1 else (conditions[0] if conditions else None)
-        results = self.vectorstore.similarity_search_with_score(query, k=k, filter=where_clause)
+        return {"$and": conditions} if len(conditions) > 1 else (conditions[0] if conditions else None)
+
+    @staticmethod
+    def _format_results(results) -> List[Dict]:
         return [{**doc.metadata, "content": doc.page_content, "score": score} for doc, score in results]
 
+    def _call_openai(self, fn: Callable, *args, **kwargs):
+        """Executa uma chamada que depende da OpenAI respeitando o cooldown pós-429.
+
+        Dentro do cooldown o último erro é relançado sem ir à rede; quem chama
+        continua tratando a falha como antes (ex.: fallback do orquestrador).
+        """
+        if self.last_error is not None and time.monotonic() < self._rate_limited_until:
+            raise self.last_error
+        try:
+            return fn(*args, **kwargs)
+        except RateLimitError as e:
+            self.last_error = e
+            self._rate_limited_until = time.monotonic() + self.RATE_LIMIT_COOLDOWN_SECONDS
+            logger.warning(f"OpenAI retornou 429; buscas RAG suspensas por {self.RATE_LIMIT_COOLDOWN_SECONDS}s")
+            raise
+
+    def search_paints(self, query: str, k: int = 3, filters: Dict = None) -> List[Dict]:
+        if not self.vectorstore: return []
+        
+        results = self._call_openai(
+            self.vectorstore.similarity_search_with_score, query, k=k, filter=self._where_clause(filters)
+        )
+        return self._format_results(results)
+
     def get_technical_context(self, query: str, filters: Dict = None) -> str:
         results = self.search_paints(query, k=1, filters=filters)
         if not results: return "Nenhum produto encontrado com estes critérios específicos."
@@ -114,4 +150,28 @@ class RAGService:
         """
         Alias retrocompatível (código antigo chamava answer_with_context).
         """
-        return self.get_technical_context(query, filters)
\ No newline at end of file
+        return self.get_technical_context(query, filters)
+
+
+# Uma instância por banco no processo: embeddings e Chroma são carregados
+# (ou indexados) uma única vez, não a cada OrchestratorAgent/requisição
+_shared_services: Dict[str, RAGService] = {}
+_shared_lock = threading.Lock()
+
+
+def get_rag_service(db: Session) -> RAGService:
+    """Retorna o RAGService compartilhado para o banco da sessão."""
+    key = str(db.get_bind().url)
+    service = _shared_services.get(key)
+    if service is None:
+        with _shared_lock:
+            service = _shared_services.get(key)
+            if service is None:
+                service = _shared_services[key] = RAGService(db)
+    return service
+
+
+def clear_rag_services() -> None:
+    """Descarta as instâncias compartilhadas (ex.: após trocar PERSIST_DIRECTORY)."""
+    with _shared_lock:
+        _shared_services.clear()
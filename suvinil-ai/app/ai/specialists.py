@@ -1,10 +1,7 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from sqlalchemy.orm import Session
 from app.repositories.paint_repository import PaintRepository
-<<<<<<< HEAD
-=======
 from app.ai.prompts import prompt_manager
->>>>>>> feature/front-configs
 
 class SpecialistRecommendation:
     def __init__(
@@ -43,9 +40,12 @@ class BaseSpecialist:
     name: str = "Base Specialist"
     expertise: str = "Geral"
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, candidate_cache: Optional[Dict[Tuple, List[Any]]] = None):
         self.db = db
         self.repository = PaintRepository
+        # Compartilhado entre os especialistas de uma mesma consulta: todos
+        # pedem os mesmos candidatos, então a busca vai ao banco uma vez só
+        self._candidate_cache = candidate_cache if candidate_cache is not None else {}
 
     def can_help(self, context: Dict) -> bool:
         """
@@ -54,43 +54,56 @@ class BaseSpecialist:
         """
         return True
 
-    def _get_base_candidates(self, context: Dict) -> List[Any]:
-        """Recupera candidatos iniciais do banco para o especialista analisar."""
-        return self.repository.recommend_candidates(
-            self.db,
+    def _get_base_candidates(self, context: Dict, with_color: bool = True) -> List[Any]:
+        """Recupera candidatos iniciais do banco para o especialista analisar.
+
+        A cor é filtrada no SQL (ILIKE em paints.cor, índice trigram); os
+        especialistas não refazem esse filtro em Python.
+        """
+        filters = dict(
             environment=context.get("ambiente"),
             surface_type=context.get("tipo_parede"),
-            color=context.get("cor"),
+            color=context.get("cor") if with_color else None,
             finish_type=context.get("acabamento"),
-            limit=200,
         )
+        key = tuple(filters.values())
+        if key not in self._candidate_cache:
+            self._candidate_cache[key] = self.repository.recommend_candidates(self.db, **filters, limit=200)
+        return list(self._candidate_cache[key])
+
+    def _get_candidates_color_fallback(
+        self, context: Dict, suitable: Callable[[Any], bool]
+    ) -> Tuple[List[Any], bool]:
+        """Candidatos na cor pedida que passam no filtro do especialista.
+
+        Se nenhum sobra depois de `suitable`, repete a busca sem a cor: a cor
+        pode existir só em tintas que o especialista descarta.
+        Retorna (candidatos, cor_indisponivel).
+        """
+        candidates = [p for p in self._get_base_candidates(context) if suitable(p)]
+        if candidates or not (context.get("cor") or "").strip():
+            return candidates, False
+        candidates = [p for p in self._get_base_candidates(context, with_color=False) if suitable(p)]
+        return candidates, bool(candidates)
 
 class SurfaceExpert(BaseSpecialist):
     """Especialista em compatibilidade por superfície (madeira/metal/parede)."""
     name = "Especialista em Superfícies e Preparação"
 
-<<<<<<< HEAD
-=======
-    def __init__(self, db: Session):
-        super().__init__(db)
+    def __init__(self, db: Session, candidate_cache: Optional[Dict[Tuple, List[Any]]] = None):
+        super().__init__(db, candidate_cache)
         self.prompts = prompt_manager.get_specialist_prompts().get('surface_expert', {})
 
->>>>>>> feature/front-configs
     def can_help(self, context: Dict) -> bool:
         surf = (context.get("tipo_parede") or "").lower()
         return any(k in surf for k in ["madeira", "mdf", "ferro", "metal", "aço", "aco", "alumin", "inox", "parede", "alvenaria", "gesso"])
 
     def analyze(self, context: Dict) -> Optional[SpecialistRecommendation]:
         surface = (context.get("tipo_parede") or "").lower()
-        cor = (context.get("cor") or "").lower()
 
         if not surface:
             return None
 
-        candidates = self._get_base_candidates(context)
-        if not candidates:
-            return None
-
         # Reforçar substring por superfície (para casos onde tipo_parede no DB é composto)
         def surface_match(p) -> bool:
             hay = (getattr(p, "tipo_parede", "") or "").lower()
@@ -102,20 +115,13 @@ class SurfaceExpert(BaseSpecialist):
                 return any(k in hay for k in ["parede", "alvenaria", "gesso", "reboco", "cimento", "massa"])
             return surface in hay
 
-        filtered = [p for p in candidates if surface_match(p)]
-        if cor:
-            filtered_color = [p for p in filtered if cor in (p.cor or "").lower()]
-            filtered = filtered_color or filtered
+        # Sem a cor pedida, qualquer cor compatível com a superfície serve
+        filtered, _ = self._get_candidates_color_fallback(context, surface_match)
 
         if not filtered:
             return None
 
         top_pick = filtered[0]
-<<<<<<< HEAD
-        return SpecialistRecommendation(
-            specialist_name=self.name,
-            reasoning=f"Para aplicar em {surface}, a {top_pick.nome} é compatível com a superfície e evita problemas de aderência/descascamento.",
-=======
         reasoning_template = self.prompts.get('reasoning_template', 
             "Para aplicar em {surface}, a {product_name} é compatível com a superfície e evita problemas de aderência/descascamento.")
         reasoning = reasoning_template.format(surface=surface, product_name=top_pick.nome)
@@ -123,7 +129,6 @@ class SurfaceExpert(BaseSpecialist):
         return SpecialistRecommendation(
             specialist_name=self.name,
             reasoning=reasoning,
->>>>>>> feature/front-configs
             recommended_paints=[top_pick],
             confidence=0.93,
             key_attributes=["Compatibilidade de superfície", "Aderência"],
@@ -134,13 +139,10 @@ class ExteriorExpert(BaseSpecialist):
     """Especialista em Resistência Climática e Fachadas."""
     name = "Consultor de Engenharia Revestimento"
     
-<<<<<<< HEAD
-=======
-    def __init__(self, db: Session):
-        super().__init__(db)
+    def __init__(self, db: Session, candidate_cache: Optional[Dict[Tuple, List[Any]]] = None):
+        super().__init__(db, candidate_cache)
         self.prompts = prompt_manager.get_specialist_prompts().get('exterior_expert', {})
     
->>>>>>> feature/front-configs
     def can_help(self, context: Dict) -> bool:
         env = (context.get("ambiente") or "").lower()
         surface = (context.get("tipo_parede") or "").lower()
@@ -155,116 +157,36 @@ class ExteriorExpert(BaseSpecialist):
         if not any(x in env or x in surface for x in ["extern", "fachada", "muro", "varanda"]):
             return None
 
-        candidates = self._get_base_candidates(context)
-        
-        # Filtra por ambiente externo
-        suitable = [
-            p for p in candidates 
-            if p.ambiente.value in ["Externo", "Interno/Externo"]
-            and "madeira" not in (p.tipo_parede or "").lower()
-        ]
-<<<<<<< HEAD
-
-        if not suitable: return None
-
-        # PRIORIDADE: Se o usuário pediu uma cor, filtrar por ela primeiro
-        if cor_solicitada:
-            with_color = [p for p in suitable if cor_solicitada in (p.cor or "").lower()]
-            if with_color:
-                suitable = with_color
-            else:
-                # Não tem a cor pedida - informar na resposta
-                top_pick = suitable[0]
-                return SpecialistRecommendation(
-                    specialist_name=self.name,
-                    reasoning=f"Não encontrei uma tinta {cor_solicitada} para externo no catálogo. "
-                              f"A opção mais próxima é {top_pick.nome} ({top_pick.cor}), que tem ótima resistência climática.",
-                    recommended_paints=[top_pick],
-                    confidence=0.7,
-                    key_attributes=["Resistência Climática"],
-                    technical_warnings=[f"Cor '{cor_solicitada}' não disponível para área externa"]
-                )
-
-        # Ordenação por robustez
-        suitable.sort(key=lambda x: "sol" in (x.features or "").lower(), reverse=True)
-        top_pick = suitable[0]
-
-        reasoning = (
-            f"Para sua varanda/área externa, recomendo a {top_pick.nome} na cor {top_pick.cor}. "
-            f"Possui excelente resistência ao tempo e proteção UV."
-        )
-
-        return SpecialistRecommendation(
-            specialist_name=self.name,
-            reasoning=reasoning,
-            recommended_paints=[top_pick],
-            confidence=0.98,
-            key_attributes=["Anti-mofo", "Proteção UV", "Resistente à chuva"]
+        # PRIORIDADE: a cor pedida já vem filtrada do banco; aqui filtra por ambiente externo
+        suitable, color_missing = self._get_candidates_color_fallback(
+            context,
+            lambda p: p.ambiente.value in ["Externo", "Interno/Externo"]
+            and "madeira" not in (p.tipo_parede or "").lower(),
         )
 
-class ColorExpert(BaseSpecialist):
-    """Especialista em Estética e Harmonização Visual."""
-    name = "Curador de Estética Suvinil"
-
-    def can_help(self, context: Dict) -> bool:
-        return bool((context.get("cor") or "").strip())
-
-    def analyze(self, context: Dict) -> Optional[SpecialistRecommendation]:
-        cor = (context.get("cor") or "").lower()
-        if not cor: return None
-
-        # Simulação de base de conhecimento de design
-        color_insights = {
-            "rosa": "O Rosa transmite delicadeza e modernidade, ideal para criar pontos de acolhimento.",
-            "cinza": "O Cinza Urbano é uma escolha minimalista que valoriza a luz natural.",
-            "azul": "Tons de azul estimulam o foco, sendo excelentes para escritórios ou fachadas serenas.",
-            "verde": "O Verde traz frescor e conexão com a natureza, perfeito para espaços de relaxamento.",
-            "branco": "O Branco é atemporal e amplia visualmente os ambientes.",
-            "amarelo": "O Amarelo traz energia e alegria, ideal para espaços de convivência.",
-            "vermelho": "O Vermelho é ousado e vibrante, perfeito para criar pontos de destaque."
-        }
-
-        candidates = self._get_base_candidates(context)
-        # Busca tintas que tenham a cor
-        matches = [
-            p for p in candidates 
-            if cor in (p.cor or "").lower()
-        ]
-
-        if not matches:
-            return SpecialistRecommendation(
-                specialist_name=self.name,
-                reasoning=f"A cor {cor} é excelente para {(context.get('ambiente') or 'o ambiente')}, mas precisamos validar a base química.",
-=======
-
         if not suitable: return None
 
-        # PRIORIDADE: Se o usuário pediu uma cor, filtrar por ela primeiro
-        if cor_solicitada:
-            with_color = [p for p in suitable if cor_solicitada in (p.cor or "").lower()]
-            if with_color:
-                suitable = with_color
-            else:
-                # Não tem a cor pedida - informar na resposta
-                top_pick = suitable[0]
-                reasoning_template = self.prompts.get('reasoning_no_color',
-                    "Não encontrei uma tinta {cor_solicitada} para externo no catálogo. A opção mais próxima é {product_name} ({color}), que tem ótima resistência climática.")
-                reasoning = reasoning_template.format(
-                    cor_solicitada=cor_solicitada, 
-                    product_name=top_pick.nome, 
-                    color=top_pick.cor
-                )
-                warning_template = self.prompts.get('warning_no_color', "Cor '{cor_solicitada}' não disponível para área externa")
-                warning = warning_template.format(cor_solicitada=cor_solicitada)
+        if color_missing:
+            # Não tem a cor pedida - informar na resposta
+            top_pick = suitable[0]
+            reasoning_template = self.prompts.get('reasoning_no_color',
+                "Não encontrei uma tinta {cor_solicitada} para externo no catálogo. A opção mais próxima é {product_name} ({color}), que tem ótima resistência climática.")
+            reasoning = reasoning_template.format(
+                cor_solicitada=cor_solicitada, 
+                product_name=top_pick.nome, 
+                color=top_pick.cor
+            )
+            warning_template = self.prompts.get('warning_no_color', "Cor '{cor_solicitada}' não disponível para área externa")
+            warning = warning_template.format(cor_solicitada=cor_solicitada)
                 
-                return SpecialistRecommendation(
-                    specialist_name=self.name,
-                    reasoning=reasoning,
-                    recommended_paints=[top_pick],
-                    confidence=0.7,
-                    key_attributes=["Resistência Climática"],
-                    technical_warnings=[warning]
-                )
+            return SpecialistRecommendation(
+                specialist_name=self.name,
+                reasoning=reasoning,
+                recommended_paints=[top_pick],
+                confidence=0.7,
+                key_attributes=["Resistência Climática"],
+                technical_warnings=[warning]
+            )
 
         # Ordenação por robustez
         suitable.sort(key=lambda x: "sol" in (x.features or "").lower(), reverse=True)
@@ -286,8 +208,8 @@ class ColorExpert(BaseSpecialist):
     """Especialista em Estética e Harmonização Visual."""
     name = "Curador de Estética Suvinil"
 
-    def __init__(self, db: Session):
-        super().__init__(db)
+    def __init__(self, db: Session, candidate_cache: Optional[Dict[Tuple, List[Any]]] = None):
+        super().__init__(db, candidate_cache)
         self.prompts = prompt_manager.get_specialist_prompts()
         self.color_insights = self.prompts.get('color_insights', {})
 
@@ -298,12 +220,8 @@ class ColorExpert(BaseSpecialist):
         cor = (context.get("cor") or "").lower()
         if not cor: return None
 
-        candidates = self._get_base_candidates(context)
-        # Busca tintas que tenham a cor
-        matches = [
-            p for p in candidates 
-            if cor in (p.cor or "").lower()
-        ]
+        # Tintas que tenham a cor (filtro ILIKE feito no banco)
+        matches = self._get_base_candidates(context)
 
         if not matches:
             no_match = self.prompts.get('color_expert', {})
@@ -316,17 +234,11 @@ class ColorExpert(BaseSpecialist):
             return SpecialistRecommendation(
                 specialist_name=self.name,
                 reasoning=reasoning,
->>>>>>> feature/front-configs
                 recommended_paints=[],
                 confidence=0.6,
                 key_attributes=["Tendência Visual"]
             )
 
-<<<<<<< HEAD
-        return SpecialistRecommendation(
-            specialist_name=self.name,
-            reasoning=color_insights.get(cor, f"A cor {cor} cria uma atmosfera personalizada e única."),
-=======
         # Buscar insight da cor no arquivo de prompts
         default_template = self.color_insights.get('default', "A cor {cor} cria uma atmosfera personalizada e única.")
         reasoning = self.color_insights.get(cor, default_template.format(cor=cor))
@@ -334,45 +246,17 @@ class ColorExpert(BaseSpecialist):
         return SpecialistRecommendation(
             specialist_name=self.name,
             reasoning=reasoning,
->>>>>>> feature/front-configs
             recommended_paints=matches[:2],
             confidence=0.95,
             key_attributes=["Harmonização", "Estética Contemporânea"]
         )
-<<<<<<< HEAD
-
-class InteriorExpert(BaseSpecialist):
-    """Especialista em Conforto Interno (Sem Odor/Lavável)."""
-    name = "Especialista em Ambientes Internos"
-
-    def can_help(self, context: Dict) -> bool:
-        env = (context.get("ambiente") or "").lower()
-        # Se explicitamente externo, não atua
-        return "extern" not in env and "fachada" not in env and "varanda" not in env
-
-    def analyze(self, context: Dict) -> Optional[SpecialistRecommendation]:
-        env = (context.get("ambiente") or "").lower()
-        cor_solicitada = (context.get("cor") or "").lower()
-        
-        if "extern" in env or "fachada" in env or "varanda" in env: 
-            return None
-
-        candidates = self._get_base_candidates(context)
-        
-        # Filtra por ambiente interno
-        interior_paints = [
-            p for p in candidates 
-            if p.ambiente.value in ["Interno", "Interno/Externo"]
-        ]
-
-=======
 
 class InteriorExpert(BaseSpecialist):
     """Especialista em Conforto Interno (Sem Odor/Lavável)."""
     name = "Especialista em Ambientes Internos"
 
-    def __init__(self, db: Session):
-        super().__init__(db)
+    def __init__(self, db: Session, candidate_cache: Optional[Dict[Tuple, List[Any]]] = None):
+        super().__init__(db, candidate_cache)
         self.prompts = prompt_manager.get_specialist_prompts().get('interior_expert', {})
 
     def can_help(self, context: Dict) -> bool:
@@ -387,54 +271,34 @@ class InteriorExpert(BaseSpecialist):
         if "extern" in env or "fachada" in env or "varanda" in env: 
             return None
 
-        candidates = self._get_base_candidates(context)
-        
-        # Filtra por ambiente interno
-        interior_paints = [
-            p for p in candidates 
-            if p.ambiente.value in ["Interno", "Interno/Externo"]
-        ]
+        # PRIORIDADE: a cor pedida já vem filtrada do banco; aqui filtra por ambiente interno
+        interior_paints, color_missing = self._get_candidates_color_fallback(
+            context, lambda p: p.ambiente.value in ["Interno", "Interno/Externo"]
+        )
 
->>>>>>> feature/front-configs
         if not interior_paints: return None
 
-        # PRIORIDADE: Se o usuário pediu uma cor, filtrar por ela primeiro
-        if cor_solicitada:
-            with_color = [p for p in interior_paints if cor_solicitada in (p.cor or "").lower()]
-            if with_color:
-                interior_paints = with_color
-            else:
-                # Não tem a cor pedida
-                top_pick = interior_paints[0]
-<<<<<<< HEAD
-                return SpecialistRecommendation(
-                    specialist_name=self.name,
-                    reasoning=f"Não encontrei uma tinta {cor_solicitada} para interno no catálogo. "
-                              f"A opção mais próxima é {top_pick.nome} ({top_pick.cor}).",
-                    recommended_paints=[top_pick],
-                    confidence=0.7,
-                    key_attributes=["Sem Odor"],
-                    technical_warnings=[f"Cor '{cor_solicitada}' não disponível"]
-=======
-                reasoning_template = self.prompts.get('reasoning_no_color',
-                    "Não encontrei uma tinta {cor_solicitada} para interno no catálogo. A opção mais próxima é {product_name} ({color}).")
-                reasoning = reasoning_template.format(
-                    cor_solicitada=cor_solicitada,
-                    product_name=top_pick.nome,
-                    color=top_pick.cor
-                )
-                warning_template = self.prompts.get('warning_no_color', "Cor '{cor_solicitada}' não disponível")
-                warning = warning_template.format(cor_solicitada=cor_solicitada)
+        if color_missing:
+            # Não tem a cor pedida
+            top_pick = interior_paints[0]
+            reasoning_template = self.prompts.get('reasoning_no_color',
+                "Não encontrei uma tinta {cor_solicitada} para interno no catálogo. A opção mais próxima é {product_name} ({color}).")
+            reasoning = reasoning_template.format(
+                cor_solicitada=cor_solicitada,
+                product_name=top_pick.nome,
+                color=top_pick.cor
+            )
+            warning_template = self.prompts.get('warning_no_color', "Cor '{cor_solicitada}' não disponível")
+            warning = warning_template.format(cor_solicitada=cor_solicitada)
                 
-                return SpecialistRecommendation(
-                    specialist_name=self.name,
-                    reasoning=reasoning,
-                    recommended_paints=[top_pick],
-                    confidence=0.7,
-                    key_attributes=["Sem Odor"],
-                    technical_warnings=[warning]
->>>>>>> feature/front-configs
-                )
+            return SpecialistRecommendation(
+                specialist_name=self.name,
+                reasoning=reasoning,
+                recommended_paints=[top_pick],
+                confidence=0.7,
+                key_attributes=["Sem Odor"],
+                technical_warnings=[warning]
+            )
 
         # Score de aderência aos requisitos de saúde
         scored = []
@@ -449,11 +313,6 @@ class InteriorExpert(BaseSpecialist):
         top_paints = [s[0] for s in scored[:2]]
 
         if top_paints:
-<<<<<<< HEAD
-            reasoning = f"Para o seu interior, recomendo a {top_paints[0].nome} na cor {top_paints[0].cor}."
-        else:
-            reasoning = "Não encontrei tintas adequadas para o ambiente interno."
-=======
             reasoning_template = self.prompts.get('reasoning_with_color',
                 "Para o seu interior, recomendo a {product_name} na cor {color}.")
             reasoning = reasoning_template.format(
@@ -463,7 +322,6 @@ class InteriorExpert(BaseSpecialist):
         else:
             reasoning = self.prompts.get('reasoning_no_products',
                 "Não encontrei tintas adequadas para o ambiente interno.")
->>>>>>> feature/front-configs
 
         return SpecialistRecommendation(
             specialist_name=self.name,
@@ -474,10 +332,15 @@ class InteriorExpert(BaseSpecialist):
         )
 
 def get_all_specialists(db: Session) -> List[BaseSpecialist]:
-    """Factory para o Agente Orquestrador."""
+    """Factory para o Agente Orquestrador.
+
+    Os especialistas retornados compartilham o cache de candidatos, então
+    uma rodada de consultas faz uma única busca por combinação de filtros.
+    """
+    candidate_cache: Dict[Tuple, List[Any]] = {}
     return [
-        SurfaceExpert(db),
-        ExteriorExpert(db),
-        InteriorExpert(db),
-        ColorExpert(db)
-    ]
\ No newline at end of file
+        SurfaceExpert(db, candidate_cache),
+        ExteriorExpert(db, candidate_cache),
+        InteriorExpert(db, candidate_cache),
+        ColorExpert(db, candidate_cache)
+    ]
@@ -1,17 +1,19 @@
 import re
 import logging
 import hashlib
+from collections import defaultdict
+from functools import lru_cache
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from datetime import datetime
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_active_user, get_current_user_optional
 from app.core.config import settings
 from app.repositories.paint_repository import PaintRepository
-from app.ai.rag_service import RAGService
+from app.ai.rag_service import get_rag_service
 from app.ai.image_generator import ImageGenerator
 from app.models.chat_message import ChatMessage
 
@@ -24,6 +26,61 @@ _agent_sessions: Dict[int, Any] = {}
 _orchestrator_sessions: Dict[Any, Any] = {}
 _fallback_state: Dict[Any, Dict[str, Any]] = {}
 
+# Palavras-chave do fallback compiladas uma vez (uma busca por mensagem em vez
+# de um teste `in` por palavra)
+_PRICE_RE = re.compile(r"preço|preco|valor|custo|quanto|caro|barato")
+_INTERNAL_ENV_RE = re.compile(r"interno|interna|interior")
+_EXTERNAL_ENV_RE = re.compile(r"externo|externa|exterior|fachada|muro|varanda")
+_CHILD_RE = re.compile(r"filho|filha|criança|anos|infantil")
+_BABY_RE = re.compile(r"bebê|bebe|recém-nascido")
+_TEEN_RE = re.compile(r"adolescente|teen")
+
+# Variações de cada cor detectada pelo fallback
+_COLOR_VARIATIONS = (
+    ("azul", ("azul", "blue")),
+    ("vermelho", ("vermelho", "vermelha", "red", "vermelhao")),
+    ("verde", ("verde", "green")),
+    ("amarelo", ("amarelo", "amarela", "yellow")),
+    ("branco", ("branco", "branca", "white")),
+    ("preto", ("preto", "preta", "black")),
+    ("cinza", ("cinza", "gray", "grey")),
+    ("rosa", ("rosa", "pink", "rosado", "rosada")),
+    ("roxo", ("roxo", "violeta", "lilas", "lilás", "roxa")),
+    ("laranja", ("laranja", "orange")),
+    ("marrom", ("marrom", "brown")),
+    ("bege", ("bege", "nude", "areia")),
+    ("turquesa", ("turquesa", "turquoise")),
+)
+_COLOR_KEYS = frozenset(key for key, _ in _COLOR_VARIATIONS)
+_COLOR_BY_VARIATION = {var: key for key, variations in _COLOR_VARIATIONS for var in variations}
+# Variações em inglês só valem como palavra inteira ("red" não casa com "reduzir")
+_ENGLISH_COLOR_WORDS = frozenset({
+    "blue", "red", "green", "yellow", "white", "black", "gray", "grey",
+    "pink", "orange", "brown", "turquoise", "nude",
+})
+
+
+def _color_alternation(words) -> str:
+    return "|".join(sorted(map(re.escape, words), key=len, reverse=True))
+
+
+# Uma varredura por mensagem. As variações em português aceitam flexões
+# ("verdes", "cinzas", "azulada", "brancas"); "azulejo" fica de fora
+_COLOR_RE = re.compile(
+    r"\b(?!azulej)(?:("
+    + _color_alternation(v for v in _COLOR_BY_VARIATION if v not in _ENGLISH_COLOR_WORDS)
+    + r")\w*|("
+    + _color_alternation(_ENGLISH_COLOR_WORDS)
+    + r")\b)"
+)
+# Termos procurados por substring no nome da cor da tinta, como nos filtros
+# originais ("Esverdeado" -> verde). Só a cor base, sem as variações do
+# detector: "red" casaria com "Azul Redentor" e "areia" não é tinta bege
+_PAINT_COLOR_TERMS = {
+    key: {"rosa": ("rosa", "pink"), "roxo": ("roxo", "violeta", "lilás", "lilas")}.get(key, (key,))
+    for key in _COLOR_KEYS
+}
+
 
 # ============================================================================
 # SCHEMAS DE REQUEST/RESPONSE
@@ -203,13 +260,31 @@ def _is_price_query(message: str) -> bool:
     m = (message or "").strip().lower()
     if not m:
         return False
-    keywords = ["preço", "preco", "valor", "custo", "quanto", "caro", "barato"]
-    if any(k in m for k in keywords):
-        return True
-    # Exemplos comuns: "quanto custa", "qual o preço"
-    return bool(re.search(r"\bquanto\s+custa\b|\bqual\s+o\s+pre[cç]o\b", m))
+    # Cobre também "quanto custa" / "qual o preço"
+    return bool(_PRICE_RE.search(m))
 
 
+@lru_cache(maxsize=256)
+def _detect_color_preference(text: str) -> Optional[str]:
+    """
+    Detecta a cor mencionada no texto (já em minúsculas).
+    Função pura e sem acesso ao banco: mensagens repetidas (ex.: "sim", "quero azul")
+    reaproveitam o resultado em cache. A resposta do fallback em si não é cacheada,
+    pois depende do estado da conversa de cada usuário.
+    """
+    match = _COLOR_RE.search(text)
+    return _COLOR_BY_VARIATION[match.group(1) or match.group(2)] if match else None
+
+def _index_paints_by_color(paints: List[Any]) -> Dict[str, Set[int]]:
+    """Agrupa, em uma passada, os ids das tintas por cor base (chaves de _COLOR_VARIATIONS)"""
+    index: Dict[str, Set[int]] = defaultdict(set)
+    for paint in paints:
+        cor = (paint.cor or "").lower()
+        for key, terms in _PAINT_COLOR_TERMS.items():
+            if any(term in cor for term in terms):
+                index[key].add(paint.id)
+    return index
+
 def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = None) -> Dict[str, Any]:
     """
     Resposta simples sem IA - usa busca no banco de dados.
@@ -218,6 +293,8 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
     """
     message_lower = message.lower()
     paints = PaintRepository.get_all(db, skip=0, limit=100)
+    # Cor base -> ids, montado no primeiro filtro por cor da requisição
+    color_ids: Optional[Dict[str, Set[int]]] = None
     paints_mentioned = []
     state = _fallback_state.setdefault(user_id or 0, {
         "last_paints": [],
@@ -342,9 +419,16 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
     
     def _filter_by_color(paints_list: List[Any], color: str) -> List[Any]:
         """Filtra lista de tintas pela cor solicitada - retorna lista vazia se não encontrar"""
+        nonlocal color_ids
         if not color:
             return paints_list
+        if color in _COLOR_KEYS:
+            if color_ids is None:
+                color_ids = _index_paints_by_color(paints)
+            ids = color_ids.get(color, ())
+            return [p for p in paints_list if p.id in ids]
         
+        # Cor fora do índice (ex.: nome exibido do catálogo): busca por substring
         filtered = []
         for p in paints_list:
             color_in_paint = (p.cor or "").lower()
@@ -356,29 +440,6 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
         # CRÍTICO: Retorna lista vazia se não encontrar, não a lista original
         return filtered
 
-    def _detect_color_preference(text: str) -> Optional[str]:
-        """Detecta a cor mencionada no texto"""
-        color_map = {
-            "azul": ["azul", "blue"],
-            "vermelho": ["vermelho", "red", "vermelhao"],
-            "verde": ["verde", "green"],
-            "amarelo": ["amarelo", "yellow"],
-            "branco": ["branco", "white"],
-            "preto": ["preto", "black"],
-            "cinza": ["cinza", "gray", "grey"],
-            "rosa": ["rosa", "pink", "rosado", "rosada"],
-            "roxo": ["roxo", "violeta", "lilas", "lilás", "roxa"],
-            "laranja": ["laranja", "orange"],
-            "marrom": ["marrom", "brown"],
-            "bege": ["bege", "nude", "areia"],
-            "turquesa": ["turquesa", "turquoise"],
-        }
-        
-        for color_key, variations in color_map.items():
-            if any(var in text for var in variations):
-                return color_key
-        return None
-
     # Se o usuário está respondendo uma pergunta pendente (ex.: "sim" / "pode"), tratar aqui.
     # (Importante: precisa vir depois das funções auxiliares acima.)
     pending = state.get("pending_action")
@@ -457,9 +518,9 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
     detected_color = _detect_color_preference(message_lower)
     if detected_color:
         state["last_color"] = detected_color
-    if any(word in message_lower for word in ["interno", "interna", "interior"]):
+    if _INTERNAL_ENV_RE.search(message_lower):
         state["last_environment"] = "interno"
-    if any(word in message_lower for word in ["externo", "externa", "exterior", "fachada", "muro", "varanda"]):
+    if _EXTERNAL_ENV_RE.search(message_lower):
         state["last_environment"] = "externo"
     
     # Detectar tipo de ambiente específico
@@ -473,16 +534,16 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
         state["last_room_type"] = "cozinha"
     
     # Detectar contexto de idade/público
-    if any(word in message_lower for word in ["filho", "filha", "criança", "anos", "infantil"]):
+    if _CHILD_RE.search(message_lower):
         # Tentar extrair idade
         age_match = re.search(r'(\d+)\s*anos?', message_lower)
         if age_match:
             state["last_age_context"] = f"criança de {age_match.group(1)} anos"
         else:
             state["last_age_context"] = "infantil"
-    elif any(word in message_lower for word in ["bebê", "bebe", "recém-nascido"]):
+    elif _BABY_RE.search(message_lower):
         state["last_age_context"] = "bebê"
-    elif any(word in message_lower for word in ["adolescente", "teen"]):
+    elif _TEEN_RE.search(message_lower):
         state["last_age_context"] = "adolescente"
 
     if not paints:
@@ -537,11 +598,7 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
             or any(word in message_lower for word in ["fachada", "muro", "exterior", "externo", "externa"])
         )
 
-        color_paints = [
-            p for p in paints
-            if any(term in (p.cor or "").lower() for term in ["rosa", "pink"])
-            or any(term in (p.cor or "").lower() for term in ["rosa", "pink"])
-        ]
+        color_paints = _filter_by_color(paints, "rosa")
 
         candidates = color_paints
         if is_exterior_request:
@@ -576,11 +633,7 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
             or any(word in message_lower for word in ["fachada", "muro", "exterior", "externo", "externa"])
         )
 
-        color_paints = [
-            p for p in paints
-            if any(term in (p.cor or "").lower() for term in ["roxo", "violeta", "lilás", "lilas"])
-            or any(term in (p.cor or "").lower() for term in ["roxo", "violeta", "lilás", "lilas"])
-        ]
+        color_paints = _filter_by_color(paints, "roxo")
 
         candidates = color_paints
         if is_exterior_request:
@@ -612,11 +665,7 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
         interior_paints = [p for p in interior_paints if _is_wall_surface(p)] or interior_paints
         color_pref = state.get("last_color")
         if color_pref == "roxo":
-            color_paints = [
-                p for p in interior_paints
-                if any(term in (p.cor or "").lower() for term in ["roxo", "violeta", "lilás", "lilas"])
-                or any(term in (p.cor or "").lower() for term in ["roxo", "violeta", "lilás", "lilas"])
-            ]
+            color_paints = _filter_by_color(interior_paints, "roxo")
             interior_paints = color_paints or interior_paints
         interior_paints = _filter_repeated(interior_paints)
         if interior_paints:
@@ -775,7 +824,7 @@ def _simple_chat_response(message: str, db: Session, user_id: Optional[int] = No
         else:
             response = "Me conta mais sobre o ambiente que ajusto a recomendação."
     
-    elif any(word in message_lower for word in ["externo", "externa", "fachada", "exterior", "muro", "varanda"]):
+    elif _EXTERNAL_ENV_RE.search(message_lower):
         exterior_paints = [p for p in paints if p.ambiente.value in ["Externo", "Interno/Externo"]]
         
         # IMPORTANTE: Considerar a cor que o usuário pediu
@@ -1260,8 +1309,8 @@ async def reindex_rag(
     db: Session = Depends(get_db),
 ):
     """Reindexa o vector store do RAG"""
-    rag_service = RAGService(db)
-    indexed_count = rag_service.reindex()
+    rag_service = get_rag_service(db)
+    indexed_count = rag_service.reindex(db)
     return ReindexResponse(
         message="Vector store atualizado com sucesso.",
         indexed_count=indexed_count
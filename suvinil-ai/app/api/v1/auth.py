@@ -6,13 +6,14 @@ Este módulo fornece:
 - Login com JWT (suporta JSON e OAuth2 form-data)
 """
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from typing import Optional
 
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_and_update_password, create_access_token
 from app.core.config import settings
 from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserLogin, UserCreate, User, Token
@@ -24,7 +25,10 @@ def _authenticate_user(db: Session, username: str, password: str):
     """Autentica usuário e retorna token"""
     user = UserRepository.get_by_username(db, username)
     
-    if not user or not verify_password(password, user.hashed_password):
+    valid, new_hash = (
+        verify_and_update_password(password, user.hashed_password) if user else (False, None)
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Usuário ou senha incorretos",
@@ -37,6 +41,10 @@ def _authenticate_user(db: Session, username: str, password: str):
             detail="Usuário inativo",
         )
     
+    # Hash em esquema/custo antigo (ex.: bcrypt): regrava uma única vez
+    if new_hash:
+        UserRepository.update_password_hash(db, user.id, new_hash)
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.username, "user_id": user.id, "role": user.role.value},
@@ -71,8 +79,8 @@ async def register(
             detail="Email já está em uso",
         )
     
-    # Criar usuário
-    user = UserRepository.create(db, user_data)
+    # Criar usuário (hash de senha fora do event loop)
+    user = await run_in_threadpool(UserRepository.create, db, user_data)
     return user
 
 
@@ -100,7 +108,7 @@ async def login(
     db: Session = Depends(get_db),
 ):
     """Endpoint de login com OAuth2 form-data"""
-    return _authenticate_user(db, form_data.username, form_data.password)
+    return await run_in_threadpool(_authenticate_user, db, form_data.username, form_data.password)
 
 
 @router.post(
@@ -114,4 +122,4 @@ async def login_json(
     db: Session = Depends(get_db),
 ):
     """Endpoint de login com JSON body"""
-    return _authenticate_user(db, credentials.username, credentials.password)
+    return await run_in_threadpool(_authenticate_user, db, credentials.username, credentials.password)
@@ -1,5 +1,6 @@
 """Endpoints de tintas"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
@@ -12,8 +13,10 @@ from app.schemas.paint import Paint, PaintCreate, PaintUpdate, PaintCount
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Paint])
+# Listagem é a resposta mais pesada: serializa com orjson em vez do json da stdlib
+@router.get("/", response_model=List[Paint], response_class=ORJSONResponse)
 async def list_paints(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     ambiente: Optional[Ambiente] = None,
@@ -22,8 +25,8 @@ async def list_paints(
     search: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
-    """Lista tintas com filtros opcionais"""
-    paints = PaintRepository.get_all(
+    """Lista tintas com filtros opcionais (total filtrado no header X-Total-Count)"""
+    paints, total = PaintRepository.get_all_with_total(
         db,
         skip=skip,
         limit=limit,
@@ -32,6 +35,7 @@ async def list_paints(
         linha=linha,
         search=search,
     )
+    response.headers["X-Total-Count"] = str(total)
     return paints
 
 
@@ -1,5 +1,6 @@
 """Endpoints de usuários"""
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
@@ -67,7 +68,8 @@ async def create_user(
     if UserRepository.get_by_email(db, user_data.email):
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    user = UserRepository.create(db, user_data)
+    # Hash de senha (argon2) roda no threadpool para não bloquear o event loop
+    user = await run_in_threadpool(UserRepository.create, db, user_data)
     return user
 
 
@@ -87,7 +89,10 @@ async def update_user(
     if current_user["role"] != UserRole.ADMIN and user_data.role:
         user_data.role = None
     
-    user = UserRepository.update(db, user_id, user_data)
+    if user_data.password:
+        user = await run_in_threadpool(UserRepository.update, db, user_id, user_data)
+    else:
+        user = UserRepository.update(db, user_id, user_data)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
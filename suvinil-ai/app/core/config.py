@@ -1,7 +1,7 @@
 """Configurações da aplicação"""
 from pathlib import Path
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -24,6 +24,9 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
     
+    # CORS (origens do frontend; no .env use JSON, ex.: ["https://app.exemplo.com"])
+    CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://127.0.0.1:5173"]
+    
     class Config:
         # Sempre carregar o .env do diretório `suvinil-ai/`, mesmo se o uvicorn
         # for iniciado a partir da raiz do repositório.
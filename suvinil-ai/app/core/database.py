@@ -1,17 +1,39 @@
 """Configuração do banco de dados"""
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+_IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+
+# psycopg2: INSERTs em lote via VALUES múltiplos e UPDATE/DELETE via execute_batch
+_engine_options = {}
+if settings.DATABASE_URL.startswith(("postgresql://", "postgresql+psycopg2://")):
+    _engine_options.update(
+        executemany_mode="values_plus_batch",
+        insertmanyvalues_page_size=1000,
+        executemany_batch_page_size=500,
+    )
+
 # Engine
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
+    **_engine_options,
 )
 
+
+if _IS_SQLITE:
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """SQLite (dev): WAL + synchronous=NORMAL evitam um fsync por commit"""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
 # Session local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
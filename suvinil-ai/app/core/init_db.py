@@ -6,26 +6,58 @@ Cria:
 - Catálogo de tintas Suvinil (carregado do arquivo XLSX)
 """
 import sys
+from collections import Counter
 from pathlib import Path
 
 # Adicionar root ao path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.core.database import engine, Base, SessionLocal
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_fast
 from app.models.user import User, UserRole
 from app.models.paint import Paint, Ambiente, Acabamento, Linha
 
+try:
+    from openpyxl import load_workbook
+except ImportError:  # dependência opcional (apenas para o seed via XLSX)
+    load_workbook = None
+
+
+# Colunas esperadas na planilha, na ordem histórica (usada como fallback
+# quando o cabeçalho não traz o nome da coluna)
+XLSX_COLUMNS = ("nome", "cor", "tipo_parede", "ambiente", "acabamento", "features", "linha")
+
+# Valores da planilha -> enums do modelo (montados uma vez, não por linha)
+_AMBIENTE_MAP = {
+    "Interno": Ambiente.INTERNO,
+    "Externo": Ambiente.EXTERNO,
+    "Interno/Externo": Ambiente.INTERNO_EXTERNO,
+}
+_ACABAMENTO_MAP = {
+    "Fosco": Acabamento.FOSCO,
+    "Acetinado": Acabamento.ACETINADO,
+    "Brilhante": Acabamento.BRILHANTE,
+}
+_LINHA_MAP = {
+    "Premium": Linha.PREMIUM,
+    "Standard": Linha.STANDARD,
+}
+
+
+def _xlsx_column_index(header_row) -> dict:
+    """Mapeia nome da coluna -> índice a partir da linha de cabeçalho"""
+    header_idx = {
+        str(name).strip().lower(): i
+        for i, name in enumerate(header_row or ())
+        if name is not None
+    }
+    return {col: header_idx.get(col, pos) for pos, col in enumerate(XLSX_COLUMNS)}
+
 
 def load_tintas_from_xlsx() -> list:
     """Carrega tintas do arquivo XLSX"""
-<<<<<<< HEAD
-    xlsx_path = Path(__file__).parent.parent / "docs" / "Base_de_Dados_de_Tintas_Suvinil.xlsx"
-    
-    if not xlsx_path.exists():
-        print(f"      AVISO: Arquivo XLSX não encontrado em {xlsx_path}")
-=======
     # Arquivo fica em /docs (raiz do projeto do backend dentro do container)
     project_root = Path(__file__).parent.parent.parent
     docs_dir = project_root / "docs"
@@ -37,76 +69,49 @@ def load_tintas_from_xlsx() -> list:
     
     if not xlsx_path or not xlsx_path.exists():
         print(f"      AVISO: Nenhum arquivo XLSX encontrado em {docs_dir}")
->>>>>>> feature/front-configs
+        return []
+    
+    if load_workbook is None:
+        print("      AVISO: openpyxl não instalado. Execute: pip install openpyxl")
         return []
     
     try:
-        from openpyxl import load_workbook
-<<<<<<< HEAD
-        wb = load_workbook(xlsx_path)
-=======
-        wb = load_workbook(xlsx_path, data_only=True)
->>>>>>> feature/front-configs
+        wb = load_workbook(xlsx_path, read_only=True, data_only=True)
         ws = wb.active
         
+        # Um único iterador: o cabeçalho é consumido com next() e o loop
+        # segue direto pelas linhas de dados (colunas localizadas pelo nome)
+        rows = ws.iter_rows(values_only=True)
+        header_row = next(rows, None)
+        col = _xlsx_column_index(header_row)
+        i_nome, i_cor, i_tipo = col["nome"], col["cor"], col["tipo_parede"]
+        i_amb, i_acab = col["ambiente"], col["acabamento"]
+        i_feat, i_linha = col["features"], col["linha"]
+        
         tintas = []
-        headers = None
         
-        for row_idx, row in enumerate(ws.iter_rows(values_only=True), 1):
-            if row_idx == 1:
-                headers = row
-                continue
-            
-            # Mapear valores do XLSX para os enums
-            ambiente_map = {
-                "Interno": Ambiente.INTERNO,
-                "Externo": Ambiente.EXTERNO,
-                "Interno/Externo": Ambiente.INTERNO_EXTERNO,
-            }
-            
-            acabamento_map = {
-                "Fosco": Acabamento.FOSCO,
-                "Acetinado": Acabamento.ACETINADO,
-                "Brilhante": Acabamento.BRILHANTE,
-            }
-            
-            linha_map = {
-                "Premium": Linha.PREMIUM,
-                "Standard": Linha.STANDARD,
-            }
-            
+        for row in rows:
             # Extrair valores da linha
-            nome = row[0]
-            cor = row[1]
-            tipo_parede = row[2]
-            ambiente_str = row[3]
-            acabamento_str = row[4]
-            features = row[5]
-            linha_str = row[6]
+            nome = row[i_nome]
             
             if not nome:  # Pular linhas vazias
                 continue
             
             tinta = {
                 "nome": nome,
-                "cor": cor,
-                "tipo_parede": tipo_parede,
-                "ambiente": ambiente_map.get(ambiente_str, Ambiente.INTERNO),
-                "acabamento": acabamento_map.get(acabamento_str, Acabamento.FOSCO),
-                "features": features,
-                "linha": linha_map.get(linha_str, Linha.STANDARD),
+                "cor": row[i_cor],
+                "tipo_parede": row[i_tipo],
+                "ambiente": _AMBIENTE_MAP.get(row[i_amb], Ambiente.INTERNO),
+                "acabamento": _ACABAMENTO_MAP.get(row[i_acab], Acabamento.FOSCO),
+                "features": row[i_feat],
+                "linha": _LINHA_MAP.get(row[i_linha], Linha.STANDARD),
             }
             tintas.append(tinta)
         
-<<<<<<< HEAD
-=======
+        wb.close()
         print(f"      XLSX carregado: {xlsx_path.name} ({len(tintas)} linhas)")
->>>>>>> feature/front-configs
         return tintas
         
-    except ImportError:
-        print("      AVISO: openpyxl não instalado. Execute: pip install openpyxl")
-        return []
     except Exception as e:
         print(f"      ERRO ao carregar XLSX: {e}")
         return []
@@ -114,9 +119,8 @@ def load_tintas_from_xlsx() -> list:
 
 def init_db():
     """Inicializa banco de dados com dados de exemplo"""
-    print("=" * 60)
-    print("   SUVINIL AI - Inicialização do Banco de Dados")
-    print("=" * 60)
+    # Blocos de várias linhas saem em um único print (uma escrita no stdout)
+    print("\n".join(["=" * 60, "   SUVINIL AI - Inicialização do Banco de Dados", "=" * 60]))
     
     print("\n[1/3] Criando tabelas...")
     Base.metadata.create_all(bind=engine)
@@ -128,55 +132,63 @@ def init_db():
         # CRIAR USUÁRIOS
         # ========================================
         admin = db.query(User).filter(User.username == "admin").first()
+        admin_id = admin.id if admin else None
         
         if not admin:
             print("\n[2/3] Criando usuários de exemplo...")
             
-            # Criar admin
-            admin = User(
-                email="admin@suvinil.com",
-                username="admin",
-                hashed_password=get_password_hash("admin123"),
-                full_name="Administrador Suvinil",
-                role=UserRole.ADMIN,
-                is_active=True,
-            )
-            db.add(admin)
-            
-            # Criar usuário comum
-            user = User(
-                email="user@suvinil.com",
-                username="user",
-                hashed_password=get_password_hash("user123"),
-                full_name="Usuário Teste",
-                role=UserRole.USER,
-                is_active=True,
-            )
-            db.add(user)
-            
-            # Criar usuário de demonstração
-            demo = User(
-                email="demo@suvinil.com",
-                username="demo",
-                hashed_password=get_password_hash("demo123"),
-                full_name="Usuário Demonstração",
-                role=UserRole.USER,
-                is_active=True,
+            # Inserção direta via Core (sem Session/identity map) em um único executemany
+            seed_users = [
+                {
+                    "email": "admin@suvinil.com",
+                    "username": "admin",
+                    "hashed_password": get_password_hash_fast("admin123"),
+                    "full_name": "Administrador Suvinil",
+                    "role": UserRole.ADMIN,
+                    "is_active": True,
+                },
+                {
+                    "email": "user@suvinil.com",
+                    "username": "user",
+                    "hashed_password": get_password_hash_fast("user123"),
+                    "full_name": "Usuário Teste",
+                    "role": UserRole.USER,
+                    "is_active": True,
+                },
+                {
+                    "email": "demo@suvinil.com",
+                    "username": "demo",
+                    "hashed_password": get_password_hash_fast("demo123"),
+                    "full_name": "Usuário Demonstração",
+                    "role": UserRole.USER,
+                    "is_active": True,
+                },
+            ]
+            # Mesma conexão da sessão (já aberta pela consulta acima): evita
+            # fazer checkout de uma segunda conexão do pool só para o INSERT
+            users_table = User.__table__
+            created = db.execute(
+                users_table.insert().returning(users_table.c.id, users_table.c.username),
+                seed_users,
             )
-            db.add(demo)
-            
+            admin_id = next(row.id for row in created if row.username == "admin")
             db.commit()
-            print("      Usuários criados:")
-            print("      - Admin: admin / admin123")
-            print("      - User:  user / user123")
-            print("      - Demo:  demo / demo123")
+            
+            print("\n".join([
+                "      Usuários criados:",
+                "      - Admin: admin / admin123",
+                "      - User:  user / user123",
+                "      - Demo:  demo / demo123",
+            ]))
         else:
             print("\n[2/3] Usuários já existem. Pulando...")
         
         # ========================================
         # CRIAR CATÁLOGO DE TINTAS (do XLSX)
         # ========================================
-        paint_count = db.query(Paint).count()
+        # Agregado direto (Query(Paint).count() envolveria um subselect com
+        # todas as colunas, inclusive as listas calculadas por column_property)
+        paint_count = db.query(func.count(Paint.id)).scalar()
         
         if paint_count == 0:
             tintas_catalogo = load_tintas_from_xlsx()
@@ -184,36 +196,32 @@ def init_db():
             if tintas_catalogo:
                 print(f"\n[3/3] Criando catálogo de tintas ({len(tintas_catalogo)} produtos do XLSX)...")
                 
-                # Buscar usuário admin para created_by
-                admin_user = db.query(User).filter(User.username == "admin").first()
-                admin_id = admin_user.id if admin_user else None
-                
-                for i, paint_data in enumerate(tintas_catalogo, 1):
-                    paint = Paint(
-                        **paint_data,
-                        is_active=True,
-                        created_by=admin_id,
-                    )
-                    db.add(paint)
-                
+                rows = [
+                    {**paint_data, "is_active": True, "created_by": admin_id}
+                    for paint_data in tintas_catalogo
+                ]
+                db.execute(Paint.__table__.insert(), rows)
                 db.commit()
-                print(f"      Catálogo completo: {len(tintas_catalogo)} tintas criadas!")
                 
-                # Mostrar resumo do catálogo
-                print("\n      Resumo do catálogo:")
-                print(f"      - Linha Premium: {len([t for t in tintas_catalogo if t['linha'] == Linha.PREMIUM])} produtos")
-                print(f"      - Linha Standard: {len([t for t in tintas_catalogo if t['linha'] == Linha.STANDARD])} produtos")
-                print(f"      - Interno: {len([t for t in tintas_catalogo if t['ambiente'] == Ambiente.INTERNO])} produtos")
-                print(f"      - Externo: {len([t for t in tintas_catalogo if t['ambiente'] == Ambiente.EXTERNO])} produtos")
-                print(f"      - Interno/Externo: {len([t for t in tintas_catalogo if t['ambiente'] == Ambiente.INTERNO_EXTERNO])} produtos")
+                # Mostrar resumo do catálogo (uma única passada pela lista)
+                linhas = Counter(t["linha"] for t in tintas_catalogo)
+                ambientes = Counter(t["ambiente"] for t in tintas_catalogo)
+                print("\n".join([
+                    f"      Catálogo completo: {len(tintas_catalogo)} tintas criadas!",
+                    "",
+                    "      Resumo do catálogo:",
+                    f"      - Linha Premium: {linhas[Linha.PREMIUM]} produtos",
+                    f"      - Linha Standard: {linhas[Linha.STANDARD]} produtos",
+                    f"      - Interno: {ambientes[Ambiente.INTERNO]} produtos",
+                    f"      - Externo: {ambientes[Ambiente.EXTERNO]} produtos",
+                    f"      - Interno/Externo: {ambientes[Ambiente.INTERNO_EXTERNO]} produtos",
+                ]))
             else:
                 print("\n[3/3] Não foi possível carregar tintas do XLSX. Pulando...")
         else:
             print(f"\n[3/3] Banco já possui {paint_count} tintas. Pulando...")
         
-        print("\n" + "=" * 60)
-        print("   Banco de dados inicializado com sucesso!")
-        print("=" * 60)
+        print("\n".join(["", "=" * 60, "   Banco de dados inicializado com sucesso!", "=" * 60]))
         
     except Exception as e:
         db.rollback()
@@ -1,35 +1,72 @@
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+from datetime import timedelta
+from typing import Optional, Tuple
 
-from jose import jwt, JWTError
+import jwt
+from jwt.exceptions import PyJWTError as JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2id para novos hashes; bcrypt continua aceito (deprecated) para
+# verificar senhas antigas, que podem ser regravadas via needs_update().
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__memory_cost=19456,
+    argon2__time_cost=2,
+    argon2__parallelism=1,
+)
+
+# Custo reduzido apenas para dados de seed (usuários de demonstração);
+# o hash continua sendo bcrypt válido e é verificado pelo pwd_context normal.
+seed_pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+
+def _normalize_password(password: str) -> str:
+    """Remove espaços das bordas e limita a 72 caracteres (limite de entrada do bcrypt).
+
+    Caminho rápido: senhas curtas e sem espaços nas bordas são devolvidas
+    como estão, sem passar por strip()/fatiamento.
+    """
+    if len(password) <= 72 and not (password[:1].isspace() or password[-1:].isspace()):
+        return password
+    return password.strip()[:72]
 
 
 def get_password_hash(password: str) -> str:
-    password = password.strip()[:72]
-    return pwd_context.hash(password)
+    return pwd_context.hash(_normalize_password(password))
+
+
+def get_password_hash_fast(password: str) -> str:
+    """Hash bcrypt de baixo custo para seed do banco (não usar em cadastros reais)"""
+    return seed_pwd_context.hash(_normalize_password(password))
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    plain_password = plain_password.strip()[:72]
-    return pwd_context.verify(plain_password, hashed_password)
+    return pwd_context.verify(_normalize_password(plain_password), hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verifica a senha e, só quando o hash está desatualizado (needs_update), gera o novo.
+
+    Retorna (válida, novo_hash); novo_hash é None se o hash atual já usa o
+    esquema/custo vigente, evitando recalcular um hash caro a cada login.
+    """
+    return pwd_context.verify_and_update(_normalize_password(plain_password), hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
-    expire = datetime.utcnow() + (
-        expires_delta
+    ttl_seconds = (
+        expires_delta.total_seconds()
         if expires_delta
-        else timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        else settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     )
-    to_encode.update({"exp": expire})
+    # "exp" como epoch inteiro (RFC 7519); o dict novo já evita mutar `data`
+    payload = {**data, "exp": int(time.time() + ttl_seconds)}
     
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
 def decode_access_token(token: str) -> Optional[dict]:
@@ -1,5 +1,25 @@
 """Modelos SQLAlchemy"""
 from app.models.user import User, UserRole
-from app.models.paint import Paint, Environment, FinishType, PaintLine
+from app.models.paint import (
+    Paint,
+    Ambiente,
+    Acabamento,
+    Linha,
+    CategoriaSuperficie,
+    Environment,
+    FinishType,
+    PaintLine,
+)
 
-__all__ = ["User", "UserRole", "Paint", "Environment", "FinishType", "PaintLine"]
+__all__ = [
+    "User",
+    "UserRole",
+    "Paint",
+    "Ambiente",
+    "Acabamento",
+    "Linha",
+    "CategoriaSuperficie",
+    "Environment",
+    "FinishType",
+    "PaintLine",
+]
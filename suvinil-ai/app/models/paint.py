@@ -1,6 +1,9 @@
 """Modelo de Tinta"""
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Enum
-from sqlalchemy.orm import relationship
+import re
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text, Enum, Index, DDL, Computed, event, func, literal, type_coerce
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred, column_property
 import enum
 from app.core.database import Base
 
@@ -25,24 +28,165 @@ class Linha(str, enum.Enum):
     STANDARD = "Standard"
 
 
+class CategoriaSuperficie(str, enum.Enum):
+    """Categoria de superfície derivada de tipo_parede (uma tinta pode ter várias)"""
+    METAL = "metal"
+    MADEIRA = "madeira"
+    PAREDE = "parede"
+
+
+# Tabela única para minúsculas + remoção de acentos (uma passada com str.translate)
+_FOLD_TABLE = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇáàâãäéèêëíìîïóòôõöúùûüç",
+    "abcdefghijklmnopqrstuvwxyzaaaaaeeeeiiiiooooouuuucaaaaaeeeeiiiiooooouuuuc",
+)
+
+# Palavras-chave por categoria, já sem acento (comparadas com o texto dobrado).
+# Ficam no modelo para servir ao default de categorias_superficie, ao
+# repositório e ao seed sem importação circular
+KEYWORD_CATEGORIES: Dict[str, Tuple[str, ...]] = {
+    "env_interno": ("intern",),
+    "env_externo": ("extern", "fachada", "muro", "varanda"),
+    "fin_fosco": ("fosc",),
+    "fin_acetinado": ("acet", "semi"),
+    "fin_brilhante": ("brilh", "gloss"),
+    "surf_metal": ("metal", "ferro", "aco", "alum", "inox"),
+    "surf_madeira": ("madeira", "mdf", "compens", "laminad"),
+    "surf_parede": ("parede", "alvenaria", "reboco", "gesso", "massa", "cimento"),
+}
+
+# Categoria de palavra-chave -> valor gravado em Paint.categorias_superficie
+_SURFACE_CATEGORIES: Dict[str, CategoriaSuperficie] = {
+    "surf_metal": CategoriaSuperficie.METAL,
+    "surf_madeira": CategoriaSuperficie.MADEIRA,
+    "surf_parede": CategoriaSuperficie.PAREDE,
+}
+
+# Todas as palavras-chave em uma única regex (um grupo nomeado por categoria):
+# o texto é percorrido uma vez só, em vez de um teste `in` por palavra
+_KEYWORD_RE = re.compile(
+    "|".join(
+        f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+        for category, keywords in KEYWORD_CATEGORIES.items()
+    )
+)
+
+
+def classify_keywords(text: Optional[str]) -> set:
+    """Categorias de KEYWORD_CATEGORIES encontradas no texto (uma passada)"""
+    if not text:
+        return set()
+    return {match.lastgroup for match in _KEYWORD_RE.finditer(text.translate(_FOLD_TABLE))}
+
+
+def surface_categories(tipo_parede: Optional[str]) -> List[str]:
+    """Categorias de superfície presentes em tipo_parede (ex.: "Madeira, Ferro")"""
+    categories = classify_keywords(tipo_parede)
+    return [
+        category.value
+        for key, category in _SURFACE_CATEGORIES.items()
+        if key in categories
+    ]
+
+
+def _categorias_superficie_default(context):
+    """Classifica tipo_parede no INSERT (vale também para inserts via Core)"""
+    return surface_categories(context.get_current_parameters().get("tipo_parede"))
+
+
+def _split_csv_column(column):
+    """Divide "a, b, c" em text[] no Postgres (sem itens vazios; NULL vira {})"""
+    parts = func.array_remove(func.regexp_split_to_array(func.trim(column), r"\s*,\s*"), "")
+    return type_coerce(func.coalesce(parts, literal("{}")), ARRAY(String))
+
+
+# Texto indexado para busca full-text (nome, cor, superfície e características)
+SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector('portuguese'::regconfig, "
+    "coalesce(nome, '') || ' ' || coalesce(cor, '') || ' ' || "
+    "coalesce(tipo_parede, '') || ' ' || coalesce(features, ''))"
+)
+
+
 class Paint(Base):
     """Modelo de Tinta - baseado na planilha Base_de_Dados_de_Tintas_Suvinil.xlsx"""
     __tablename__ = "paints"
+    __table_args__ = (
+        # Formato comum dos filtros de listagem (is_active + ambiente/acabamento/linha)
+        Index("ix_paints_active_env_finish_line", "is_active", "ambiente", "acabamento", "linha"),
+        # Busca por substring (ILIKE '%termo%') em nome, cor, superfície e características
+        *(
+            Index(
+                f"ix_paints_{col}_trgm",
+                col,
+                postgresql_using="gin",
+                postgresql_ops={col: "gin_trgm_ops"},
+            )
+            for col in ("nome", "cor", "tipo_parede", "features")
+        ),
+        # Busca textual (PaintRepository.get_all/count_active com `search`)
+        Index("ix_paints_search", "search_vector", postgresql_using="gin"),
+        # Filtro de superfície em recommend_candidates (categorias_superficie @> ARRAY[...])
+        Index("ix_paints_categorias_superficie", "categorias_superficie", postgresql_using="gin"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     nome = Column(String, nullable=False, index=True)
     cor = Column(String, nullable=True)
     tipo_parede = Column(String, nullable=True)
-    ambiente = Column(Enum(Ambiente), nullable=False, default=Ambiente.INTERNO)
-    acabamento = Column(Enum(Acabamento), nullable=False, default=Acabamento.FOSCO)
+    # Categorias (metal/madeira/parede) de tipo_parede, pré-calculadas na escrita
+    categorias_superficie = Column(
+        ARRAY(String(16)),
+        nullable=False,
+        default=_categorias_superficie_default,
+    )
+    # Enums gravados como VARCHAR (native_enum=False): sem tipo ENUM no Postgres,
+    # novos valores não exigem ALTER TYPE e a validação fica no lado Python
+    ambiente = Column(Enum(Ambiente, native_enum=False, validate_strings=True, length=16), nullable=False, default=Ambiente.INTERNO)
+    acabamento = Column(Enum(Acabamento, native_enum=False, validate_strings=True, length=16), nullable=False, default=Acabamento.FOSCO)
     features = Column(Text, nullable=True)
-    linha = Column(Enum(Linha), nullable=False, default=Linha.STANDARD)
+    linha = Column(Enum(Linha, native_enum=False, validate_strings=True, length=16), nullable=False, default=Linha.STANDARD)
     is_active = Column(Boolean, default=True)
     
+    # Coluna gerada pelo Postgres; deferred para não trafegar em SELECTs comuns
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+    ))
+    
+    # Listas já divididas pelo banco para o schema de resposta (features/aplicacao)
+    features_list = column_property(_split_csv_column(features))
+    aplicacao_list = column_property(_split_csv_column(tipo_parede))
+    
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_by_user = relationship("User", back_populates="paints")
 
 
-Environment = Ambiente
-FinishType = Acabamento
-PaintLine = Linha
+# Prefixo de cor em B-tree: find_by_color usa lower(cor) LIKE 'azul%'
+Index(
+    "ix_paints_cor_lower_prefix",
+    func.lower(Paint.cor).label("cor_lower"),
+    postgresql_ops={"cor_lower": "text_pattern_ops"},
+)
+
+
+# Índices parciais só com as tintas ativas: todo acesso do repositório filtra
+# is_active = true (WHERE is_active), então o índice ignora as linhas de soft delete e fica menor
+Index("ix_paints_active_id", Paint.id, postgresql_where=Paint.is_active)
+Index("ix_paints_active_ambiente", Paint.ambiente, postgresql_where=Paint.is_active)
+Index("ix_paints_active_acabamento", Paint.acabamento, postgresql_where=Paint.is_active)
+
+
+# Os índices trigram dependem da extensão pg_trgm (create_all em banco novo)
+event.listen(
+    Paint.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+# Nomes alternativos (código/testes antigos) apontam para os mesmos enums:
+# há uma única definição de cada enum e um único caminho de importação
+Environment = PaintAmbiente = Ambiente
+FinishType = PaintAcabamento = Acabamento
+PaintLine = PaintLinha = Linha
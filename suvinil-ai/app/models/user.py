@@ -21,7 +21,9 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     full_name = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
-    role = Column(Enum(UserRole), default=UserRole.USER, nullable=False)
+    role = Column(Enum(UserRole, native_enum=False, validate_strings=True, length=16), default=UserRole.USER, nullable=False)
     
     # Relacionamentos
-    paints = relationship("Paint", back_populates="created_by_user", lazy="dynamic")
+    # Lista carregada sob demanda; para vários usuários use
+    # options(selectinload(User.paints)) e resolva tudo em um único IN
+    paints = relationship("Paint", back_populates="created_by_user", lazy="select")
@@ -1,18 +1,62 @@
 """Repository para operações de banco de dados com Tintas"""
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+import time
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func, or_, insert, update, select, lambda_stmt
 
-from app.models.paint import Paint, Ambiente, Acabamento, Linha
+from app.models.paint import (
+    Paint,
+    Ambiente,
+    Acabamento,
+    Linha,
+    classify_keywords,
+    surface_categories,
+)
+
+
+# Cache em processo de get_available_colors: url do banco -> (expira_em, cores)
+COLORS_CACHE_TTL_SECONDS = 300
+_colors_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
+# Colunas carregadas nas listagens: exatamente as do schema de resposta `Paint`
+# (search_vector e categorias_superficie ficam de fora)
+_LIST_COLUMNS = (
+    Paint.id,
+    Paint.nome,
+    Paint.cor,
+    Paint.tipo_parede,
+    Paint.ambiente,
+    Paint.acabamento,
+    Paint.features,
+    Paint.features_list,
+    Paint.aplicacao_list,
+    Paint.linha,
+    Paint.is_active,
+    Paint.created_by,
+)
 
 
 class PaintRepository:
     """Repository para gerenciar tintas no banco de dados"""
 
+    # Curingas que indicam busca por padrão (ILIKE) em vez de full-text
+    _SEARCH_WILDCARDS = ("*", "%", "_")
+
     @staticmethod
     def _normalize_text(value: Optional[str]) -> str:
         return (value or "").strip().lower()
 
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        """Escapa curingas de LIKE (%, _) para busca literal"""
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def _classify(text: Optional[str]) -> set:
+        """Retorna as categorias de palavra-chave encontradas no texto (uma passada)"""
+        return classify_keywords(text)
+
     @staticmethod
     def _parse_environment_filter(environment: Optional[str]) -> Optional[List[Ambiente]]:
         """
@@ -20,41 +64,41 @@ class PaintRepository:
         - "interno" inclui Interno e Interno/Externo
         - "externo" inclui Externo e Interno/Externo
         """
-        env = PaintRepository._normalize_text(environment)
-        if not env:
-            return None
-        if "intern" in env:
+        categories = PaintRepository._classify(environment)
+        if "env_interno" in categories:
             return [Ambiente.INTERNO, Ambiente.INTERNO_EXTERNO]
-        if any(k in env for k in ["extern", "fachada", "muro", "varanda"]):
+        if "env_externo" in categories:
             return [Ambiente.EXTERNO, Ambiente.INTERNO_EXTERNO]
         return None
 
     @staticmethod
     def _parse_finish(acabamento: Optional[str]) -> Optional[Acabamento]:
-        a = PaintRepository._normalize_text(acabamento)
-        if not a:
-            return None
-        if "fosc" in a:
+        categories = PaintRepository._classify(acabamento)
+        if "fin_fosco" in categories:
             return Acabamento.FOSCO
-        if "acet" in a or "semi" in a:
+        if "fin_acetinado" in categories:
             return Acabamento.ACETINADO
-        if "brilh" in a or "gloss" in a:
+        if "fin_brilhante" in categories:
             return Acabamento.BRILHANTE
         return None
 
     @staticmethod
     def _surface_keywords(surface_type: Optional[str]) -> List[str]:
+        """Termos de ILIKE para superfície sem categoria conhecida
+
+        Sinônimos (metal/madeira/parede) já viram filtro por
+        categorias_superficie em recommend_candidates.
+        """
         s = PaintRepository._normalize_text(surface_type)
-        if not s:
-            return []
-        # Normalização de sinônimos comuns
-        if any(k in s for k in ["ferro", "metal", "aço", "aco", "alum", "inox"]):
-            return ["metal", "ferro", "aço", "aco", "alum", "inox"]
-        if any(k in s for k in ["madeira", "mdf", "compens", "laminad"]):
-            return ["madeira", "mdf", "compens", "laminad"]
-        if any(k in s for k in ["parede", "alvenaria", "reboco", "gesso", "massa", "cimento"]):
-            return ["parede", "alvenaria", "reboco", "gesso", "massa", "cimento"]
-        return [s]
+        return [s] if s else []
+
+    # Classificação definida no modelo (também usada pelo default da coluna e pelo seed)
+    surface_categories = staticmethod(surface_categories)
+
+    @staticmethod
+    def _search_clause(search: str):
+        """Filtro full-text (tsvector + índice GIN) para o termo de busca"""
+        return Paint.search_vector.op("@@")(func.plainto_tsquery("portuguese", search))
 
     @staticmethod
     def recommend_candidates(
@@ -68,11 +112,11 @@ class PaintRepository:
         """
         Busca estruturada no catálogo para recomendação:
         - ambiente: interno/externo (inclui Interno/Externo)
-        - superfície: substring + sinônimos (madeira/metal/parede)
+        - superfície: categoria pré-calculada (madeira/metal/parede) ou substring
         - cor: substring (ex.: "azul" casa com "azul claro")
         - acabamento: fosco/acetinado/brilhante
         """
-        q = db.query(Paint).filter(Paint.is_active == True)
+        q = db.query(Paint).options(load_only(*_LIST_COLUMNS)).filter(Paint.is_active == True)
 
         env_list = PaintRepository._parse_environment_filter(environment)
         if env_list:
@@ -86,10 +130,15 @@ class PaintRepository:
         if cor:
             q = q.filter(Paint.cor.ilike(f"%{cor}%"))
 
-        surface_terms = PaintRepository._surface_keywords(surface_type)
-        if surface_terms:
-            surface_ors = [Paint.tipo_parede.ilike(f"%{term}%") for term in surface_terms]
-            q = q.filter(or_(*surface_ors))
+        surface_category = next(iter(PaintRepository.surface_categories(surface_type)), None)
+        if surface_category:
+            # Sinônimo conhecido: filtra pela coluna pré-calculada (índice GIN)
+            q = q.filter(Paint.categorias_superficie.contains([surface_category]))
+        else:
+            surface_terms = PaintRepository._surface_keywords(surface_type)
+            if surface_terms:
+                surface_ors = [Paint.tipo_parede.ilike(f"%{term}%") for term in surface_terms]
+                q = q.filter(or_(*surface_ors))
 
         return q.limit(limit).all()
     
@@ -103,8 +152,68 @@ class PaintRepository:
         linha: Optional[Linha] = None,
         search: Optional[str] = None
     ) -> List[Paint]:
-        """Retorna todas as tintas ativas com filtros opcionais"""
-        query = db.query(Paint).filter(Paint.is_active == True)
+        """Retorna todas as tintas ativas com filtros opcionais
+
+        Usa lambda_stmt: o SQL compilado fica em cache por combinação de
+        filtros presentes; os valores entram apenas como parâmetros.
+        """
+        stmt = lambda_stmt(
+            lambda: select(Paint).options(load_only(*_LIST_COLUMNS)).where(Paint.is_active == True)
+        )
+        
+        if ambiente:
+            stmt += lambda s: s.where(Paint.ambiente == ambiente)
+        
+        if acabamento:
+            stmt += lambda s: s.where(Paint.acabamento == acabamento)
+        
+        if linha:
+            stmt += lambda s: s.where(Paint.linha == linha)
+        
+        if search:
+            # `search` vira parâmetro rastreado pela lambda: o helper é reaproveitado
+            # sem quebrar o cache do SQL
+            stmt += lambda s: s.where(PaintRepository._search_clause(search))
+        
+        stmt += lambda s: s.offset(skip).limit(limit)
+        return db.execute(stmt).scalars().all()
+    
+    @staticmethod
+    def get_all_stream(db: Session, batch_size: int = 100) -> Iterator[Paint]:
+        """Percorre todas as tintas ativas em lotes (cursor no servidor)
+
+        Com yield_per o driver usa stream_results: no máximo `batch_size`
+        linhas/objetos ficam em memória por vez, em vez do catálogo inteiro.
+        """
+        stmt = (
+            select(Paint)
+            .options(load_only(*_LIST_COLUMNS))
+            .where(Paint.is_active == True)
+            .order_by(Paint.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from db.execute(stmt).scalars()
+    
+    @staticmethod
+    def get_all_with_total(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        ambiente: Optional[Ambiente] = None,
+        acabamento: Optional[Acabamento] = None,
+        linha: Optional[Linha] = None,
+        search: Optional[str] = None
+    ) -> Tuple[List[Paint], int]:
+        """Retorna a página de tintas e o total filtrado em uma única consulta
+
+        O total vem de COUNT(*) OVER (), calculado sobre o mesmo filtro antes
+        do OFFSET/LIMIT (evita a segunda ida ao banco de count_active).
+        """
+        query = (
+            db.query(Paint, func.count().over().label("total"))
+            .options(load_only(*_LIST_COLUMNS))
+            .filter(Paint.is_active == True)
+        )
         
         if ambiente:
             query = query.filter(Paint.ambiente == ambiente)
@@ -116,20 +225,27 @@ class PaintRepository:
             query = query.filter(Paint.linha == linha)
         
         if search:
-            query = query.filter(
-                or_(
-                    Paint.nome.ilike(f"%{search}%"),
-                    Paint.cor.ilike(f"%{search}%"),
-                    Paint.features.ilike(f"%{search}%")
-                )
-            )
+            query = query.filter(PaintRepository._search_clause(search))
         
-        return query.offset(skip).limit(limit).all()
+        rows = query.offset(skip).limit(limit).all()
+        if rows:
+            return [paint for paint, _ in rows], rows[0].total
+        
+        # Página além do fim: não há linha para carregar o total
+        if skip:
+            total = PaintRepository.count_active(
+                db, ambiente=ambiente, acabamento=acabamento, linha=linha, search=search
+            )
+            return [], total
+        return [], 0
     
     @staticmethod
     def get_by_id(db: Session, paint_id: int) -> Optional[Paint]:
-        """Retorna tinta por ID"""
-        return db.query(Paint).filter(Paint.id == paint_id, Paint.is_active == True).first()
+        """Retorna tinta por ID (SQL compilado uma vez e reaproveitado via lambda_stmt)"""
+        stmt = lambda_stmt(
+            lambda: select(Paint).where(Paint.id == paint_id, Paint.is_active == True)
+        )
+        return db.execute(stmt).scalars().first()
     
     @staticmethod
     def count_active(
@@ -152,13 +268,7 @@ class PaintRepository:
             query = query.filter(Paint.linha == linha)
         
         if search:
-            query = query.filter(
-                or_(
-                    Paint.nome.ilike(f"%{search}%"),
-                    Paint.cor.ilike(f"%{search}%"),
-                    Paint.features.ilike(f"%{search}%")
-                )
-            )
+            query = query.filter(PaintRepository._search_clause(search))
         
         return query.scalar()
     
@@ -172,36 +282,66 @@ class PaintRepository:
         skip: int = 0,
         limit: int = 50
     ) -> List[Paint]:
-        """Busca tintas com filtros"""
-        q = db.query(Paint).filter(Paint.is_active == True)
+        """Busca tintas com filtros
+
+        Montada com lambda_stmt: cada combinação de filtros presentes tem seu
+        SQL compilado em cache; termos de busca entram apenas como parâmetros.
+        """
+        stmt = lambda_stmt(
+            lambda: select(Paint).options(load_only(*_LIST_COLUMNS)).where(Paint.is_active == True)
+        )
         
         if query:
-            q = q.filter(
-                or_(
-                    Paint.nome.ilike(f"%{query}%"),
-                    Paint.cor.ilike(f"%{query}%"),
-                    Paint.features.ilike(f"%{query}%")
+            if any(wildcard in query for wildcard in PaintRepository._SEARCH_WILDCARDS):
+                # Busca por padrão explícito (ex.: "azul*"): mantém ILIKE
+                pattern = query.replace("*", "%")
+                stmt += lambda s: s.where(
+                    or_(
+                        Paint.nome.ilike(pattern),
+                        Paint.cor.ilike(pattern),
+                        Paint.features.ilike(pattern)
+                    )
+                )
+            else:
+                stmt += lambda s: s.where(
+                    Paint.search_vector.op("@@")(func.plainto_tsquery("portuguese", query))
                 )
-            )
         
         if ambiente:
             env_list = PaintRepository._parse_environment_filter(ambiente)
             if env_list:
-                q = q.filter(Paint.ambiente.in_(env_list))
+                stmt += lambda s: s.where(Paint.ambiente.in_(env_list))
         
         if acabamento:
             finish_enum = PaintRepository._parse_finish(acabamento)
             if finish_enum:
-                q = q.filter(Paint.acabamento == finish_enum)
+                stmt += lambda s: s.where(Paint.acabamento == finish_enum)
         
         if cor:
-            q = q.filter(Paint.cor.ilike(f"%{cor}%"))
+            cor_pattern = f"%{cor}%"
+            stmt += lambda s: s.where(Paint.cor.ilike(cor_pattern))
         
-        return q.offset(skip).limit(limit).all()
+        stmt += lambda s: s.offset(skip).limit(limit)
+        return db.execute(stmt).scalars().all()
+    
+    @staticmethod
+    def clear_colors_cache() -> None:
+        """Invalida o cache de cores (chamado após escrita em tintas)"""
+        _colors_cache.clear()
     
     @staticmethod
     def get_available_colors(db: Session) -> List[Dict[str, Any]]:
-        """Retorna lista de cores disponíveis no catálogo com contagem"""
+        """Retorna lista de cores disponíveis no catálogo com contagem
+
+        O resultado fica em cache por COLORS_CACHE_TTL_SECONDS; create/update/delete
+        invalidam o cache.
+        """
+        cache_key = str(db.get_bind().url)
+        now = time.monotonic()
+        cached = _colors_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return list(cached[1])
+        
         colors = db.query(
             Paint.cor,
             func.count(Paint.id).label('count')
@@ -214,14 +354,17 @@ class PaintRepository:
             func.count(Paint.id).desc()
         ).all()
         
-        return [
+        # `if cor` já descarta vazios: lower() roda uma vez por linha, sem condicional
+        result = [
             {
-                "cor": cor.lower() if cor else "",
+                "cor": cor.lower(),
                 "cor_display": cor,
                 "count": count
             }
             for cor, count in colors if cor
         ]
+        _colors_cache[cache_key] = (now + COLORS_CACHE_TTL_SECONDS, result)
+        return list(result)
     
     @staticmethod
     def find_by_color(
@@ -231,11 +374,16 @@ class PaintRepository:
         acabamento: Optional[str] = None,
         limit: int = 10
     ) -> List[Paint]:
-        """Busca tintas por cor específica"""
-        q = db.query(Paint).filter(
-            Paint.is_active == True,
-            Paint.cor.ilike(f"%{cor}%")
-        )
+        """Busca tintas por cor específica
+
+        Os nomes de cor do catálogo começam pela cor base ("Azul Sereno"), então
+        a busca tenta primeiro o início: lower(cor) LIKE 'azul%' usa o índice
+        B-tree ix_paints_cor_lower_prefix em vez de varrer a tabela. Termos que
+        aparecem no meio do nome ("claro", "sereno") não casam pelo prefixo e
+        caem no ILIKE por substring (índice trigram ix_paints_cor_trgm).
+        """
+        term = PaintRepository._escape_like(PaintRepository._normalize_text(cor))
+        q = db.query(Paint).filter(Paint.is_active == True)
         
         if ambiente:
             q = q.filter(Paint.ambiente == ambiente)
@@ -243,38 +391,69 @@ class PaintRepository:
         if acabamento:
             q = q.filter(Paint.acabamento == acabamento)
         
-        return q.limit(limit).all()
+        paints = q.filter(func.lower(Paint.cor).like(f"{term}%", escape="\\")).limit(limit).all()
+        if paints:
+            return paints
+        return q.filter(Paint.cor.ilike(f"%{term}%", escape="\\")).limit(limit).all()
     
     @staticmethod
-    def create(db: Session, paint_data: dict, created_by: Optional[int] = None) -> Paint:
-        """Cria nova tinta"""
-        paint = Paint(**paint_data, created_by=created_by)
-        db.add(paint)
+    def _write_returning(db: Session, stmt) -> Optional[Paint]:
+        """
+        Executa um INSERT/UPDATE com RETURNING da tinta e faz o commit.
+        
+        As listas (features_list/aplicacao_list) não são colunas da tabela e
+        vêm pedidas explicitamente no mesmo RETURNING. A instância sai da
+        sessão antes do commit: com expire_on_commit ela seria expirada e a
+        serialização da resposta dispararia outro SELECT.
+        """
+        row = db.execute(
+            stmt.returning(Paint, Paint.features_list, Paint.aplicacao_list)
+        ).one_or_none()
+        paint = None
+        if row is not None:
+            paint, features_list, aplicacao_list = row
+            set_committed_value(paint, "features_list", features_list)
+            set_committed_value(paint, "aplicacao_list", aplicacao_list)
+            db.expunge(paint)
         db.commit()
-        db.refresh(paint)
+        return paint
+    
+    @staticmethod
+    def create(db: Session, paint_data: dict, created_by: Optional[int] = None) -> Paint:
+        """Cria nova tinta (valores gerados pelo banco voltam via RETURNING)"""
+        stmt = insert(Paint).values(**paint_data, created_by=created_by)
+        paint = PaintRepository._write_returning(db, stmt)
+        PaintRepository.clear_colors_cache()
         return paint
     
     @staticmethod
     def update(db: Session, paint_id: int, paint_data: dict) -> Optional[Paint]:
-        """Atualiza tinta existente"""
-        paint = db.query(Paint).filter(Paint.id == paint_id).first()
-        if not paint:
-            return None
+        """Atualiza tinta existente com um único UPDATE ... RETURNING"""
+        if not paint_data:
+            return db.query(Paint).filter(Paint.id == paint_id).first()
         
-        for key, value in paint_data.items():
-            setattr(paint, key, value)
+        if "tipo_parede" in paint_data:
+            paint_data = {
+                **paint_data,
+                "categorias_superficie": surface_categories(paint_data["tipo_parede"]),
+            }
         
-        db.commit()
-        db.refresh(paint)
+        stmt = update(Paint).where(Paint.id == paint_id).values(**paint_data)
+        paint = PaintRepository._write_returning(db, stmt)
+        PaintRepository.clear_colors_cache()
         return paint
     
     @staticmethod
     def delete(db: Session, paint_id: int) -> bool:
-        """Soft delete - marca como inativa"""
-        paint = db.query(Paint).filter(Paint.id == paint_id).first()
-        if not paint:
-            return False
-        
-        paint.is_active = False
+        """Soft delete - marca como inativa em um único UPDATE (rowcount indica se existia)"""
+        stmt = (
+            update(Paint)
+            .where(Paint.id == paint_id, Paint.is_active == True)
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = db.execute(stmt).rowcount == 1
         db.commit()
-        return True
+        if deleted:
+            PaintRepository.clear_colors_cache()
+        return deleted
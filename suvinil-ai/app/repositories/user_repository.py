@@ -1,7 +1,9 @@
 """Repository de Usuários"""
+from sqlalchemy import delete, update
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from app.models.user import User
+from app.models.paint import Paint
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash
 
@@ -47,29 +49,57 @@ class UserRepository:
     
     @staticmethod
     def update(db: Session, user_id: int, user_data: UserUpdate) -> Optional[User]:
-        """Atualiza usuário"""
-        db_user = UserRepository.get_by_id(db, user_id)
-        if not db_user:
-            return None
-        
+        """Atualiza usuário com um único UPDATE ... RETURNING"""
         update_data = user_data.model_dump(exclude_unset=True)
+        if not update_data:
+            return UserRepository.get_by_id(db, user_id)
+        
         if "password" in update_data:
             update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
         
-        for key, value in update_data.items():
-            setattr(db_user, key, value)
-        
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+            .returning(User)
+        )
+        db_user = db.execute(stmt).scalar_one_or_none()
+        # Sai da sessão antes do commit: com expire_on_commit a instância vinda
+        # do RETURNING seria expirada e recarregada (SELECT) na serialização
+        if db_user is not None:
+            db.expunge(db_user)
         db.commit()
-        db.refresh(db_user)
         return db_user
     
+    @staticmethod
+    def update_password_hash(db: Session, user_id: int, hashed_password: str) -> None:
+        """Regrava apenas o hash de senha (rehash após login com hash antigo)"""
+        db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(hashed_password=hashed_password)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    
     @staticmethod
     def delete(db: Session, user_id: int) -> bool:
-        """Deleta usuário"""
-        db_user = UserRepository.get_by_id(db, user_id)
-        if not db_user:
+        """Deleta usuário direto no banco (DELETE ... WHERE id, sem SELECT prévio)"""
+        # Mesmo efeito do delete via ORM: tintas do usuário ficam sem autor
+        db.execute(
+            update(Paint)
+            .where(Paint.created_by == user_id)
+            .values(created_by=None)
+            .execution_options(synchronize_session=False)
+        )
+        result = db.execute(
+            delete(User)
+            .where(User.id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            db.rollback()
             return False
         
-        db.delete(db_user)
         db.commit()
         return True
@@ -1,11 +1,6 @@
 """Schemas de Tinta"""
-<<<<<<< HEAD
-from pydantic import BaseModel
-from typing import Optional
-=======
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import AliasChoices, BaseModel, Field, field_validator, model_validator
 from typing import Optional, List
->>>>>>> feature/front-configs
 from app.models.paint import Ambiente, Acabamento, Linha
 
 
@@ -55,8 +50,10 @@ class Paint(BaseModel):
     tipo_parede: Optional[str] = None
     ambiente: Ambiente
     acabamento: Acabamento
-    features: List[str] = []
-    aplicacao: List[str] = []
+    # Vindo do ORM, as listas chegam prontas (Paint.features_list/aplicacao_list,
+    # divididas no Postgres); os validadores só dividem entradas em texto
+    features: List[str] = Field([], validation_alias=AliasChoices("features_list", "features"))
+    aplicacao: List[str] = Field([], validation_alias=AliasChoices("aplicacao_list", "aplicacao"))
     linha: Linha
     is_active: bool
     created_by: Optional[int] = None
@@ -16,22 +16,35 @@ from __future__ import annotations
 
 import argparse
 import csv
+import io
 import sys
+from itertools import islice
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 # Adicionar root do backend ao path (suvinil-ai/)
 BACKEND_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(BACKEND_ROOT))
 
+from sqlalchemy import and_, bindparam, insert, or_, text, tuple_, update
 from sqlalchemy.orm import Session
 
 from app.core.database import Base, SessionLocal, engine
-from app.models.paint import Acabamento, Ambiente, Linha, Paint
+from app.models.paint import Acabamento, Ambiente, Linha, Paint, surface_categories
 from app.models.user import User
+from app.repositories.paint_repository import PaintRepository
 
 
+# Linhas por executemany no INSERT em lote (limita o tamanho de cada statement)
+INSERT_BATCH_SIZE = 1000
+# Linhas por COPY FROM STDIN na tabela de staging (Postgres)
+COPY_BATCH_SIZE = 10000
+
+# Colunas do CSV gerado para o COPY (staging ou, com --truncate, direto em paints)
+_COPY_COLUMNS = ("nome", "cor", "tipo_parede", "categorias_superficie", "ambiente", "acabamento", "features", "linha")
+
 EXPECTED_HEADERS_PT = ["nome", "cor", "tipo_parede", "ambiente", "acabamento", "features", "linha"]
 HEADER_ALIASES: Dict[str, str] = {
     # pt-br
@@ -50,6 +63,8 @@ HEADER_ALIASES: Dict[str, str] = {
     "finish_type": "acabamento",
     "line": "linha",
 }
+# Mesmo mapa com chaves já em minúsculas: um único lookup por cabeçalho
+_HEADER_ALIASES_CI: Dict[str, str] = {k.lower(): v for k, v in HEADER_ALIASES.items()}
 
 
 def _norm(s: Optional[str]) -> Optional[str]:
@@ -59,13 +74,18 @@ def _norm(s: Optional[str]) -> Optional[str]:
     return v if v != "" else None
 
 
-def _norm_key(s: Optional[str]) -> str:
-    return (_norm(s) or "").strip().lower()
+# Vocabulário usual do CSV (valores dos enums em minúsculas) resolvido por
+# lookup direto; só valores fora dele caem na busca por substring. Os
+# _parse_* ficam em lru_cache: o CSV repete poucos valores distintos por coluna
+_AMBIENTE_BY_KEY: Dict[str, Ambiente] = {
+    **{a.value.lower(): a for a in Ambiente},
+    "ambos": Ambiente.INTERNO_EXTERNO,
+}
+_ACABAMENTO_BY_KEY: Dict[str, Acabamento] = {a.value.lower(): a for a in Acabamento}
+_LINHA_BY_KEY: Dict[str, Linha] = {l.value.lower(): l for l in Linha}
 
 
-def _parse_ambiente(value: Optional[str]) -> Ambiente:
-    v = _norm(value) or ""
-    key = _norm_key(v)
+def _match_ambiente(key: str) -> Ambiente:
     if "interno/externo" in key or "ambos" in key or (("intern" in key) and ("extern" in key)):
         return Ambiente.INTERNO_EXTERNO
     if "extern" in key:
@@ -73,8 +93,7 @@ def _parse_ambiente(value: Optional[str]) -> Ambiente:
     return Ambiente.INTERNO
 
 
-def _parse_acabamento(value: Optional[str]) -> Acabamento:
-    key = _norm_key(value)
+def _match_acabamento(key: str) -> Acabamento:
     if "acet" in key or "semi" in key:
         return Acabamento.ACETINADO
     if "brilh" in key:
@@ -82,84 +101,145 @@ def _parse_acabamento(value: Optional[str]) -> Acabamento:
     return Acabamento.FOSCO
 
 
-def _parse_linha(value: Optional[str]) -> Linha:
-    key = _norm_key(value)
+def _match_linha(key: str) -> Linha:
     if "prem" in key:
         return Linha.PREMIUM
     return Linha.STANDARD
 
 
+@lru_cache(maxsize=256)
+def _parse_ambiente(value: Optional[str]) -> Ambiente:
+    key = value.strip().lower() if value else ""
+    return _AMBIENTE_BY_KEY.get(key) or _match_ambiente(key)
+
+
+@lru_cache(maxsize=256)
+def _parse_acabamento(value: Optional[str]) -> Acabamento:
+    key = value.strip().lower() if value else ""
+    return _ACABAMENTO_BY_KEY.get(key) or _match_acabamento(key)
+
+
+@lru_cache(maxsize=256)
+def _parse_linha(value: Optional[str]) -> Linha:
+    key = value.strip().lower() if value else ""
+    return _LINHA_BY_KEY.get(key) or _match_linha(key)
+
+
 def _pick_default_csv_path(docs_dir: Path) -> Path:
-    candidates = sorted(docs_dir.glob("*.csv"))
-    preferred = [p for p in candidates if "Base_de_Dados_de_Tintas_Suvinil" in p.name]
-    picked = (preferred[0] if preferred else (candidates[0] if candidates else None))
+    # Uma passada, sem ordenar a lista: guarda o menor nome preferido e o
+    # menor nome geral (mesma escolha de sorted(...)[0])
+    preferred: Optional[Path] = None
+    fallback: Optional[Path] = None
+    for p in docs_dir.glob("*.csv"):
+        if "Base_de_Dados_de_Tintas_Suvinil" in p.name:
+            if preferred is None or p < preferred:
+                preferred = p
+        elif fallback is None or p < fallback:
+            fallback = p
+    picked = preferred or fallback
     if not picked:
         raise FileNotFoundError(f"Nenhum CSV encontrado em {docs_dir}")
     return picked
 
 
+_SNIFF_DELIMITERS = (",", ";", "\t", "|")
+
+
 def _sniff_dialect(sample: str) -> csv.Dialect:
+    # Caminho rápido: cabeçalho só com vírgulas (o formato do CSV do catálogo)
+    # dispensa o Sniffer, que varre a amostra inteira atrás de padrões
+    header = sample.partition("\n")[0]
+    if "," in header and not any(d in header for d in _SNIFF_DELIMITERS[1:]):
+        return csv.get_dialect("excel")
+
     sniffer = csv.Sniffer()
     try:
-        return sniffer.sniff(sample, delimiters=[",", ";", "\t", "|"])
+        return sniffer.sniff(sample, delimiters=list(_SNIFF_DELIMITERS))
     except Exception:
         return csv.get_dialect("excel")
 
 
-def _read_rows(csv_path: Path) -> Tuple[List[str], List[Dict[str, Optional[str]]]]:
-    raw = csv_path.read_text(encoding="utf-8-sig", errors="replace")
-    sample = raw[:4096]
-    dialect = _sniff_dialect(sample)
-    reader = csv.DictReader(raw.splitlines(), dialect=dialect)
+@lru_cache(maxsize=64)
+def _map_header(header: str) -> Optional[str]:
+    """Coluna do modelo para um cabeçalho do CSV (None se não reconhecido)"""
+    return _HEADER_ALIASES_CI.get(header.strip().lower())
 
-    if reader.fieldnames is None:
-        raise ValueError(f"CSV sem cabeçalho: {csv_path}")
 
-    headers = [h.strip() for h in reader.fieldnames if h is not None]
-    rows: List[Dict[str, Optional[str]]] = []
-    for r in reader:
-        normalized: Dict[str, Optional[str]] = {}
-        for k, v in r.items():
-            if k is None:
-                continue
-            key = k.strip()
-            mapped = HEADER_ALIASES.get(key, HEADER_ALIASES.get(key.lower()))
-            if not mapped:
-                continue
-            normalized[mapped] = _norm(v)
-        rows.append(normalized)
-    return headers, rows
+def _clear_paints(db: Session) -> None:
+    """Esvazia a tabela de tintas na transação corrente.
 
+    No Postgres usa TRUNCATE (sem varrer/marcar linha a linha e reiniciando
+    a sequência de ids); no SQLite, que não tem TRUNCATE, cai para DELETE.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(f"TRUNCATE TABLE {Paint.__tablename__} RESTART IDENTITY"))
+    else:
+        db.query(Paint).delete(synchronize_session=False)
 
-def load_tintas_from_csv(csv_path: Path) -> List[dict]:
-    headers, rows = _read_rows(csv_path)
 
-    # Validação leve de cabeçalho (aceita aliases)
-    mapped_headers = {HEADER_ALIASES.get(h, HEADER_ALIASES.get(h.lower(), h.lower())) for h in headers}
-    missing = [h for h in EXPECTED_HEADERS_PT if h not in mapped_headers]
+def _csv_column_index(csv_path: Path, header: Optional[List[str]]) -> Dict[str, int]:
+    """Mapeia coluna do modelo -> índice no CSV (aceita aliases) e valida o cabeçalho"""
+    if not header:
+        raise ValueError(f"CSV sem cabeçalho: {csv_path}")
+
+    index: Dict[str, int] = {}
+    for i, h in enumerate(header):
+        mapped = _map_header(h)
+        if mapped:
+            index[mapped] = i
+
+    missing = [h for h in EXPECTED_HEADERS_PT if h not in index]
     if missing:
         raise ValueError(
             f"CSV não tem as colunas esperadas. Faltando: {missing}. "
-            f"Encontrado: {headers}"
+            f"Encontrado: {[h.strip() for h in header]}"
         )
+    return index
 
-    tintas: List[dict] = []
-    for idx, row in enumerate(rows, 2):  # linha 1 é cabeçalho
-        nome = _norm(row.get("nome"))
-        if not nome:
-            continue
-        tinta = {
-            "nome": nome,
-            "cor": _norm(row.get("cor")),
-            "tipo_parede": _norm(row.get("tipo_parede")),
-            "ambiente": _parse_ambiente(row.get("ambiente")),
-            "acabamento": _parse_acabamento(row.get("acabamento")),
-            "features": _norm(row.get("features")),
-            "linha": _parse_linha(row.get("linha")),
-        }
-        tintas.append(tinta)
-
-    return tintas
+
+def iter_tintas_from_csv(csv_path: Path, delimiter: Optional[str] = None) -> Iterator[dict]:
+    """Lê o CSV linha a linha (memória constante) e gera as tintas já convertidas
+
+    Usa csv.reader (listas) com os índices das colunas resolvidos uma vez a
+    partir do cabeçalho, em vez de montar e remapear um dict por linha.
+    Com `delimiter` informado, a detecção do dialeto é pulada.
+    """
+    with csv_path.open(encoding="utf-8-sig", errors="replace", newline="") as f:
+        if delimiter:
+            reader = csv.reader(f, dialect="excel", delimiter=delimiter)
+        else:
+            dialect = _sniff_dialect(f.read(4096))
+            f.seek(0)
+            reader = csv.reader(f, dialect=dialect)
+        header = next(reader, None)
+        index = _csv_column_index(csv_path, header)
+        i_nome, i_cor, i_tipo, i_amb, i_acab, i_feat, i_linha = (index[c] for c in EXPECTED_HEADERS_PT)
+        width = len(header)
+
+        # Nomes locais no laço: sem busca global por campo a cada linha
+        norm = _norm
+        parse_ambiente, parse_acabamento, parse_linha = _parse_ambiente, _parse_acabamento, _parse_linha
+
+        for row in reader:
+            # Linha curta: colunas ausentes ficam vazias (como o restval do DictReader)
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            nome = norm(row[i_nome])
+            if not nome:
+                continue
+            yield {
+                "nome": nome,
+                "cor": norm(row[i_cor]),
+                "tipo_parede": norm(row[i_tipo]),
+                "ambiente": parse_ambiente(norm(row[i_amb])),
+                "acabamento": parse_acabamento(norm(row[i_acab])),
+                "features": norm(row[i_feat]),
+                "linha": parse_linha(norm(row[i_linha])),
+            }
+
+
+def load_tintas_from_csv(csv_path: Path, delimiter: Optional[str] = None) -> List[dict]:
+    return list(iter_tintas_from_csv(csv_path, delimiter))
 
 
 @dataclass(frozen=True)
@@ -169,6 +249,179 @@ class SeedResult:
     updated: int
 
 
+def _supports_copy(db: Session) -> bool:
+    """COPY FROM STDIN via copy_expert só existe no driver psycopg2"""
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+
+def _paint_key(data: dict) -> Tuple[str, Optional[str], Linha]:
+    """Chave idempotente do seed (nome+cor+linha)"""
+    return (data["nome"], data.get("cor"), data["linha"])
+
+
+@lru_cache(maxsize=256)
+def _categorias_literal(tipo_parede: Optional[str]) -> str:
+    """Literal de array do Postgres com as categorias de superfície (poucos valores distintos no CSV)"""
+    return "{" + ",".join(surface_categories(tipo_parede)) + "}"
+
+
+def _copy_row(data: dict) -> list:
+    """Linha do CSV do COPY, na ordem de _COPY_COLUMNS"""
+    return [
+        data["nome"],
+        data.get("cor"),
+        data.get("tipo_parede"),
+        _categorias_literal(data.get("tipo_parede")),
+        # Enums gravados pelo nome (mesmo formato do Enum(native_enum=False))
+        data["ambiente"].name,
+        data["acabamento"].name,
+        data.get("features"),
+        data["linha"].name,
+    ]
+
+
+def _copy_rows(cursor, table: str, columns: Iterable[str], rows: List[list]) -> None:
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def _copy_stream(db: Session, table: str, columns: Iterable[str], rows: Iterable[list]) -> int:
+    """Envia as linhas por COPY FROM STDIN em lotes de COPY_BATCH_SIZE; retorna o total
+
+    Usa a mesma conexão/transação da sessão: o COPY entra no commit/rollback do seed.
+    """
+    columns = tuple(columns)
+    cursor = db.connection().connection.cursor()
+    total = 0
+    batch: List[list] = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= COPY_BATCH_SIZE:
+                _copy_rows(cursor, table, columns, batch)
+                total += len(batch)
+                batch.clear()
+        if batch:
+            _copy_rows(cursor, table, columns, batch)
+            total += len(batch)
+    finally:
+        cursor.close()
+    return total
+
+
+def _copy_paints_direct(db: Session, tintas: Iterable[dict], admin_id: Optional[int]) -> SeedResult:
+    """COPY direto em paints, para a tabela recém-esvaziada (--truncate).
+
+    Sem staging nem INSERT ... SELECT: com a tabela vazia não há o que
+    comparar no banco; só as duplicatas do próprio CSV são descartadas aqui.
+    """
+    seen = set()
+    duplicates = 0
+    # is_active/created_by iguais em todas as linhas: fixos no fim de cada linha
+    tail = ["t", admin_id]
+
+    def rows() -> Iterator[list]:
+        nonlocal duplicates
+        for data in tintas:
+            key = _paint_key(data)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            yield _copy_row(data) + tail
+
+    inserted = _copy_stream(db, Paint.__tablename__, (*_COPY_COLUMNS, "is_active", "created_by"), rows())
+    return SeedResult(inserted=inserted, skipped=duplicates, updated=0)
+
+
+def _copy_paints(
+    db: Session,
+    tintas: Iterable[dict],
+    admin_id: Optional[int],
+    update_existing: bool = False,
+) -> SeedResult:
+    """Grava via COPY para uma tabela temporária + comandos set-based.
+
+    As linhas continuam sendo normalizadas em Python (enums, categorias de
+    superfície), mas chegam ao banco por COPY, sem executemany. Depois, um
+    UPDATE ... FROM (com `update_existing`) e um INSERT ... SELECT resolvem
+    existência, atualização e inserção no próprio banco, mantendo a
+    idempotência (nome+cor+linha). Duplicatas do próprio CSV são ignoradas
+    (fica a primeira ocorrência).
+    """
+    db.execute(text(
+        "CREATE TEMP TABLE _paints_stage ("
+        " ord bigserial, nome text, cor text, tipo_parede text,"
+        " categorias_superficie varchar(16)[], ambiente varchar(16),"
+        " acabamento varchar(16), features text, linha varchar(16)"
+        ") ON COMMIT DROP"
+    ))
+    total = _copy_stream(db, "_paints_stage", _COPY_COLUMNS, (_copy_row(data) for data in tintas))
+
+    # Remove duplicatas do CSV na staging (fica a primeira ocorrência)
+    duplicates = db.execute(text(
+        "DELETE FROM _paints_stage a USING _paints_stage b"
+        " WHERE a.nome = b.nome AND a.cor IS NOT DISTINCT FROM b.cor AND a.linha = b.linha"
+        " AND a.ord > b.ord"
+    )).rowcount
+    distinct = total - duplicates
+
+    # UPDATE antes do INSERT: as tintas recém-inseridas não contam como atualizadas
+    if update_existing:
+        db.execute(text(
+            "UPDATE paints p SET"
+            " tipo_parede = s.tipo_parede, categorias_superficie = s.categorias_superficie,"
+            " ambiente = s.ambiente, acabamento = s.acabamento, features = s.features, is_active = true"
+            " FROM _paints_stage s"
+            " WHERE p.nome = s.nome AND p.cor IS NOT DISTINCT FROM s.cor AND p.linha = s.linha"
+        ))
+
+    inserted = db.execute(
+        text(
+            "INSERT INTO paints"
+            " (nome, cor, tipo_parede, categorias_superficie, ambiente, acabamento, features, linha, is_active, created_by)"
+            " SELECT nome, cor, tipo_parede, categorias_superficie, ambiente, acabamento, features, linha, true, :created_by"
+            " FROM _paints_stage s"
+            " WHERE NOT EXISTS ("
+            "  SELECT 1 FROM paints p"
+            "  WHERE p.nome = s.nome AND p.cor IS NOT DISTINCT FROM s.cor AND p.linha = s.linha"
+            " )"
+        ),
+        {"created_by": admin_id},
+    ).rowcount
+    # Libera a staging já (permite outro seed na mesma transação)
+    db.execute(text("DROP TABLE _paints_stage"))
+
+    # Contagem por chave do CSV (independe de duplicatas já existentes no banco)
+    existing = distinct - inserted
+    if update_existing:
+        return SeedResult(inserted=inserted, skipped=duplicates, updated=existing)
+    return SeedResult(inserted=inserted, skipped=duplicates + existing, updated=0)
+
+
+def _existing_by_key(db: Session, chunk: List[dict]) -> Dict[tuple, int]:
+    """Busca, em uma consulta, os ids das tintas já gravadas com as chaves do lote
+
+    Só colunas (tuplas), sem carregar objetos Paint no identity map.
+    """
+    keys = {_paint_key(d) for d in chunk}
+    with_cor = [k for k in keys if k[1] is not None]
+    # cor NULL não casa em IN (NULL = NULL é desconhecido): comparação à parte
+    without_cor = [(nome, linha) for nome, cor, linha in keys if cor is None]
+
+    conditions = []
+    if with_cor:
+        conditions.append(tuple_(Paint.nome, Paint.cor, Paint.linha).in_(with_cor))
+    if without_cor:
+        conditions.append(and_(Paint.cor.is_(None), tuple_(Paint.nome, Paint.linha).in_(without_cor)))
+
+    rows = db.query(Paint.id, Paint.nome, Paint.cor, Paint.linha).filter(or_(*conditions))
+    return {(nome, cor, linha): paint_id for paint_id, nome, cor, linha in rows}
+
+
 def seed_paints(
     db: Session,
     tintas: Iterable[dict],
@@ -178,53 +431,71 @@ def seed_paints(
     truncate: bool = False,
     update_existing: bool = False,
 ) -> SeedResult:
-    admin_user = db.query(User).filter(User.username == created_by_username).first()
-    admin_id = admin_user.id if admin_user else None
+    """Aplica o seed na transação corrente da sessão (não faz commit).
+
+    O chamador controla a transação (ex.: `with db.begin():`), de modo que
+    truncate, atualizações e todos os lotes de INSERT são gravados juntos
+    ou desfeitos juntos.
+    """
+    # Só o id (sem carregar o User no identity map da sessão)
+    admin_id = db.query(User.id).filter(User.username == created_by_username).scalar()
 
     if truncate and not dry_run:
-        db.query(Paint).delete()
-        db.commit()
+        _clear_paints(db)
+
+    # Caminho rápido (Postgres): sem consulta por linha nem executemany
+    if not dry_run and _supports_copy(db):
+        if truncate and not update_existing:
+            return _copy_paints_direct(db, tintas, admin_id)
+        return _copy_paints(db, tintas, admin_id, update_existing=update_existing)
 
     inserted = 0
     skipped = 0
     updated = 0
+    new_keys = set()
+    rows_iter = iter(tintas)
+    paints_table = Paint.__table__
+
+    # Um lote do CSV por vez: uma consulta de existência e um executemany por lote
+    while chunk := list(islice(rows_iter, INSERT_BATCH_SIZE)):
+        existing_map = _existing_by_key(db, chunk)
+        new_rows: List[dict] = []
+        update_rows: List[dict] = []
+
+        for data in chunk:
+            key = _paint_key(data)
+            existing_id = existing_map.get(key)
+
+            if existing_id is not None:
+                if update_existing and not dry_run:
+                    update_rows.append({
+                        **data,
+                        "_id": existing_id,
+                        "categorias_superficie": surface_categories(data.get("tipo_parede")),
+                        "is_active": True,
+                    })
+                    updated += 1
+                else:
+                    skipped += 1
+                continue
 
-    for data in tintas:
-        # chave idempotente simples (ajuste se necessário)
-        existing = (
-            db.query(Paint)
-            .filter(
-                Paint.nome == data["nome"],
-                Paint.cor == data.get("cor"),
-                Paint.linha == data["linha"],
-            )
-            .first()
-        )
-
-        if existing:
-            if update_existing and not dry_run:
-                for k, v in data.items():
-                    setattr(existing, k, v)
-                existing.is_active = True
-                updated += 1
-            else:
+            # Repetida no próprio CSV: a primeira ocorrência já entrou
+            if key in new_keys:
                 skipped += 1
-            continue
-
-        if dry_run:
+                continue
+            new_keys.add(key)
             inserted += 1
-            continue
 
-        paint = Paint(
-            **data,
-            is_active=True,
-            created_by=admin_id,
-        )
-        db.add(paint)
-        inserted += 1
+            if not dry_run:
+                new_rows.append({**data, "is_active": True, "created_by": admin_id})
 
-    if not dry_run:
-        db.commit()
+        # Core executemany na Table (sem o caminho de bulk do ORM nem RETURNING);
+        # gravado antes da consulta de existência do próximo lote
+        if new_rows:
+            db.execute(insert(paints_table), new_rows)
+        # UPDATE em lote pela chave primária: SET com as demais chaves de cada dict
+        if update_rows:
+            db.execute(update(paints_table).where(paints_table.c.id == bindparam("_id")), update_rows)
 
     return SeedResult(inserted=inserted, skipped=skipped, updated=updated)
 
@@ -244,6 +515,12 @@ def main() -> int:
         default="admin",
         help="Usuário que será usado no campo created_by (default: admin)",
     )
+    parser.add_argument(
+        "--delimiter",
+        type=str,
+        default=None,
+        help="Delimitador do CSV (ex.: ';'); se omitido, é detectado a partir do arquivo",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Não escreve no banco, só calcula inserts")
     parser.add_argument("--truncate", action="store_true", help="Apaga a tabela de tintas antes de inserir")
     parser.add_argument(
@@ -261,10 +538,8 @@ def main() -> int:
         repo_root = BACKEND_ROOT.parent
         csv_path = (repo_root / csv_path).resolve()
 
-    print("=" * 60)
-    print("   SUVINIL AI - Seed do Catálogo (CSV)")
-    print("=" * 60)
-    print(f"\nCSV: {csv_path}")
+    # Blocos de várias linhas saem em um único print (uma escrita no stdout)
+    print("\n".join(["=" * 60, "   SUVINIL AI - Seed do Catálogo (CSV)", "=" * 60, "", f"CSV: {csv_path}"]))
 
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV não encontrado: {csv_path}")
@@ -272,28 +547,40 @@ def main() -> int:
     # Garante tabelas (útil em ambiente novo/dev)
     Base.metadata.create_all(bind=engine)
 
-    tintas = load_tintas_from_csv(csv_path)
-    print(f"Linhas válidas carregadas: {len(tintas)}")
+    # Gerador: as linhas são lidas do CSV à medida que o seed avança
+    tintas = iter_tintas_from_csv(csv_path, args.delimiter)
 
     db = SessionLocal()
     try:
-        result = seed_paints(
-            db,
-            tintas,
-            created_by_username=args.created_by_username,
-            dry_run=args.dry_run,
-            truncate=args.truncate,
-            update_existing=args.update_existing,
-        )
-        print("\nResultado:")
+        # Uma única transação para todo o seed: commit no fim, rollback em erro
+        with db.begin():
+            result = seed_paints(
+                db,
+                tintas,
+                created_by_username=args.created_by_username,
+                dry_run=args.dry_run,
+                truncate=args.truncate,
+                update_existing=args.update_existing,
+            )
+        PaintRepository.clear_colors_cache()
+        lines = [
+            f"Linhas válidas lidas: {result.inserted + result.skipped + result.updated}",
+            "",
+            "Resultado:",
+        ]
         if args.dry_run:
-            print(f"- Inseriria: {result.inserted}")
-            print(f"- Pularia:  {result.skipped}")
-            print(f"- Atualizaria: {result.updated} (somente com --update-existing)")
+            lines += [
+                f"- Inseriria: {result.inserted}",
+                f"- Pularia:  {result.skipped}",
+                f"- Atualizaria: {result.updated} (somente com --update-existing)",
+            ]
         else:
-            print(f"- Inseridos: {result.inserted}")
-            print(f"- Pulados:   {result.skipped}")
-            print(f"- Atualizados: {result.updated}")
+            lines += [
+                f"- Inseridos: {result.inserted}",
+                f"- Pulados:   {result.skipped}",
+                f"- Atualizados: {result.updated}",
+            ]
+        print("\n".join(lines))
         return 0
     finally:
         db.close()
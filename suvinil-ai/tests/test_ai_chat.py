@@ -0,0 +1,82 @@
+"""Testes para as funções auxiliares do chat em modo fallback (sem IA)"""
+import pytest
+
+
+@pytest.fixture(scope="session")
+def ai_chat_module():
+    """Módulo app.api.v1.ai_chat, importado só quando um teste do chat roda
+
+    A importação puxa o RAG (openai/langchain/Chroma); coletar este arquivo
+    com -k filtrando outros testes não paga esse custo.
+    """
+    import app.api.v1.ai_chat
+    return app.api.v1.ai_chat
+
+
+class TestDetectColorPreference:
+    """Testes para _detect_color_preference"""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("quero pintar de azul", "azul"),
+        ("quero um tom de verde", "verde"),
+        # Flexões comuns em português
+        ("quero paredes verdes", "verde"),
+        ("tons cinzas", "cinza"),
+        ("tinta azulada", "azul"),
+        ("paredes brancas", "branco"),
+        ("portas pretas", "preto"),
+        ("um tom rosado", "rosa"),
+        ("lilás", "roxo"),
+        # Variações em inglês como palavra inteira
+        ("red wall", "vermelho"),
+        ("something grey", "cinza"),
+    ])
+    def test_detects_color(self, ai_chat_module, text, expected):
+        """Teste: Detecta a cor base, inclusive no plural/feminino"""
+        assert ai_chat_module._detect_color_preference(text) == expected
+
+    @pytest.mark.parametrize("text", [
+        "quero trocar o azulejo",
+        "preciso reduzir custos",
+        "greenish",
+        "quero pintar meu quarto",
+    ])
+    def test_ignores_false_positives(self, ai_chat_module, text):
+        """Teste: Não confunde palavras que só começam/contêm o nome da cor"""
+        assert ai_chat_module._detect_color_preference(text) is None
+
+    def test_first_mentioned_color_wins(self, ai_chat_module):
+        """Teste: Com várias cores, vale a primeira mencionada"""
+        assert ai_chat_module._detect_color_preference("verde ou azul") == "verde"
+
+
+class TestIndexPaintsByColor:
+    """Testes para _index_paints_by_color"""
+
+    def test_groups_paints_by_base_color(self, ai_chat_module, paint_stub):
+        """Teste: Agrupa os ids pela cor base, por substring no nome da cor"""
+        paints = [
+            paint_stub(id=1, cor="Azul Celeste"),
+            paint_stub(id=2, cor="Verde Esverdeado"),
+            paint_stub(id=3, cor="Cinza Esverdeado"),
+            paint_stub(id=4, cor="Lilás Suave"),
+            paint_stub(id=5, cor=None),
+        ]
+
+        index = ai_chat_module._index_paints_by_color(paints)
+
+        assert index["azul"] == {1}
+        assert index["verde"] == {2, 3}
+        assert index["cinza"] == {3}
+        assert index["roxo"] == {4}
+
+    @pytest.mark.parametrize("cor,not_in", [
+        # "red" é variação do detector, não da cor da tinta
+        ("Azul Redentor", "vermelho"),
+        ("Areia Clara", "bege"),
+    ])
+    def test_ignores_detector_only_variations(self, ai_chat_module, paint_stub, cor, not_in):
+        """Teste: Variações só do detector (inglês, sinônimos) não classificam a tinta"""
+        index = ai_chat_module._index_paints_by_color([paint_stub(id=1, cor=cor)])
+
+        assert 1 not in index.get(not_in, ())
@@ -1,9 +1,33 @@
 """Testes para o módulo de geração de imagens (ImageGenerator)"""
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from app.ai.image_generator import ImageGenerator, generate_paint_visualization_simple
 
 
+IMAGE_PROMPTS = {
+    'color_descriptions': {
+        'azul': 'vibrant azure blue',
+        'verde': 'fresh forest green',
+        'vermelho': 'bold crimson red',
+        'default': '{color} paint'
+    },
+    'finish_descriptions': {
+        'fosco': 'matte finish',
+        'brilhante': 'glossy finish',
+        'acetinado': 'satin finish',
+        'default': 'matte finish'
+    },
+    'environment_map': {
+        'sala': 'living room',
+        'quarto': 'bedroom',
+        'cozinha': 'kitchen',
+        'fachada': 'exterior facade'
+    },
+    'dalle_prompt_template': 'A photorealistic {environment} with walls painted in {color_desc} with {finish_desc}'
+}
+
+
 class TestImageGenerator:
     """Testes para a classe ImageGenerator"""
     
@@ -15,41 +39,22 @@ class TestImageGenerator:
         mock_response.data[0].url = "https://example.com/generated-image.png"
         return mock_response
     
-    @pytest.fixture
-    def mock_settings(self):
-        """Fixture para configurações mockadas"""
-        with patch('app.ai.image_generator.settings') as mock:
-            mock.OPENAI_API_KEY = "test-api-key-12345"
-            yield mock
-    
-    @pytest.fixture
-    def mock_prompt_manager(self):
-        """Fixture para prompt manager mockado"""
-        with patch('app.ai.image_generator.prompt_manager') as mock:
-            mock.get_image_prompts.return_value = {
-                'color_descriptions': {
-                    'azul': 'vibrant azure blue',
-                    'verde': 'fresh forest green',
-                    'vermelho': 'bold crimson red',
-                    'default': '{color} paint'
-                },
-                'finish_descriptions': {
-                    'fosco': 'matte finish',
-                    'brilhante': 'glossy finish',
-                    'acetinado': 'satin finish',
-                    'default': 'matte finish'
-                },
-                'environment_map': {
-                    'sala': 'living room',
-                    'quarto': 'bedroom',
-                    'cozinha': 'kitchen',
-                    'fachada': 'exterior facade'
-                },
-                'dalle_prompt_template': 'A photorealistic {environment} with walls painted in {color_desc} with {finish_desc}'
-            }
-            yield mock
+    @pytest.fixture(autouse=True)
+    def _patch_deps(self, monkeypatch):
+        """Fixture automática: API key e prompts de imagem fixos para todos os testes
+
+        monkeypatch troca só os atributos necessários (sem envolver o módulo
+        inteiro em MagicMock) e restaura tudo ao final de cada teste.
+        """
+        monkeypatch.setattr(
+            "app.ai.image_generator.settings.OPENAI_API_KEY", "test-api-key-12345"
+        )
+        monkeypatch.setattr(
+            "app.ai.image_generator.prompt_manager.get_image_prompts",
+            lambda: IMAGE_PROMPTS,
+        )
     
-    def test_initialization_success(self, mock_settings, mock_prompt_manager):
+    def test_initialization_success(self):
         """Teste: Inicialização bem-sucedida do ImageGenerator"""
         generator = ImageGenerator()
         
@@ -59,15 +64,14 @@ class TestImageGenerator:
         assert generator.environment_map is not None
         assert generator.dalle_prompt_template is not None
     
-    def test_initialization_without_api_key(self, mock_prompt_manager):
+    def test_initialization_without_api_key(self, monkeypatch):
         """Teste: Inicialização falha sem API key"""
-        with patch('app.ai.image_generator.settings') as mock_settings:
-            mock_settings.OPENAI_API_KEY = None
-            
-            with pytest.raises(ValueError, match="OPENAI_API_KEY não configurada"):
-                ImageGenerator()
+        monkeypatch.setattr("app.ai.image_generator.settings.OPENAI_API_KEY", None)
+        
+        with pytest.raises(ValueError, match="OPENAI_API_KEY não configurada"):
+            ImageGenerator()
     
-    def test_build_prompt_with_default_color(self, mock_settings, mock_prompt_manager):
+    def test_build_prompt_with_default_color(self):
         """Teste: Construção de prompt com cor padrão (não mapeada)"""
         generator = ImageGenerator()
         
@@ -81,7 +85,7 @@ class TestImageGenerator:
         assert "living room" in prompt.lower() or "sala" in prompt.lower()
         assert "matte" in prompt.lower() or "fosco" in prompt.lower()
     
-    def test_build_prompt_with_mapped_color(self, mock_settings, mock_prompt_manager):
+    def test_build_prompt_with_mapped_color(self):
         """Teste: Construção de prompt com cor mapeada"""
         generator = ImageGenerator()
         
@@ -98,8 +102,6 @@ class TestImageGenerator:
     @pytest.mark.asyncio
     async def test_generate_paint_visualization_success(
         self, 
-        mock_settings, 
-        mock_prompt_manager, 
         mock_openai_response
     ):
         """Teste: Geração de visualização bem-sucedida"""
@@ -128,8 +130,6 @@ class TestImageGenerator:
     @pytest.mark.asyncio
     async def test_generate_paint_visualization_with_different_sizes(
         self, 
-        mock_settings, 
-        mock_prompt_manager, 
         mock_openai_response
     ):
         """Teste: Geração com diferentes tamanhos de imagem"""
@@ -152,11 +152,7 @@ class TestImageGenerator:
             assert call_args.kwargs['size'] == size
     
     @pytest.mark.asyncio
-    async def test_generate_paint_visualization_api_error(
-        self, 
-        mock_settings, 
-        mock_prompt_manager
-    ):
+    async def test_generate_paint_visualization_api_error(self):
         """Teste: Tratamento de erro da API OpenAI"""
         generator = ImageGenerator()
         
@@ -175,8 +171,6 @@ class TestImageGenerator:
     @pytest.mark.asyncio
     async def test_generate_comparison_success(
         self, 
-        mock_settings, 
-        mock_prompt_manager, 
         mock_openai_response
     ):
         """Teste: Geração de comparação entre duas cores"""
@@ -194,11 +188,7 @@ class TestImageGenerator:
         assert generator.client.images.generate.call_count == 2
     
     @pytest.mark.asyncio
-    async def test_generate_comparison_first_image_fails(
-        self, 
-        mock_settings, 
-        mock_prompt_manager
-    ):
+    async def test_generate_comparison_first_image_fails(self):
         """Teste: Comparação falha se primeira imagem der erro"""
         generator = ImageGenerator()
         
@@ -214,11 +204,31 @@ class TestImageGenerator:
                 environment="quarto"
             )
     
+    @pytest.mark.asyncio
+    async def test_generate_comparison_failure_cancels_other_image(self, monkeypatch):
+        """Teste: Se uma imagem falha, a outra chamada é cancelada (não fica rodando)"""
+        generator = ImageGenerator()
+        second_cancelled = asyncio.Event()
+        
+        async def fake_generate(color, environment):
+            if color == "azul":
+                raise Exception("First image generation failed")
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                second_cancelled.set()
+                raise
+        
+        monkeypatch.setattr(generator, 'generate_paint_visualization', fake_generate)
+        
+        with pytest.raises(Exception, match="First image generation failed"):
+            await generator.generate_comparison(color1="azul", color2="verde")
+        
+        assert second_cancelled.is_set()
+    
     @pytest.mark.asyncio
     async def test_generate_paint_visualization_simple_success(
         self, 
-        mock_settings, 
-        mock_prompt_manager, 
         mock_openai_response
     ):
         """Teste: Função auxiliar generate_paint_visualization_simple"""
@@ -240,7 +250,7 @@ class TestImageGenerator:
             )
     
     @pytest.mark.asyncio
-    async def test_generate_paint_visualization_simple_error(self, mock_settings, mock_prompt_manager):
+    async def test_generate_paint_visualization_simple_error(self):
         """Teste: Função auxiliar retorna None em caso de erro"""
         with patch('app.ai.image_generator.ImageGenerator') as MockGenerator:
             mock_instance = MockGenerator.return_value
@@ -255,7 +265,7 @@ class TestImageGenerator:
             
             assert result is None
     
-    def test_build_prompt_all_parameters(self, mock_settings, mock_prompt_manager):
+    def test_build_prompt_all_parameters(self):
         """Teste: Construção de prompt com todos os parâmetros"""
         generator = ImageGenerator()
         
@@ -1,12 +1,15 @@
 """Testes unitários para models de tinta"""
 import pytest
+from sqlalchemy.dialects import sqlite
 from app.models.paint import (
+    Paint,
     Ambiente,
     Acabamento,
     Linha,
     Environment,
     FinishType,
-    PaintLine
+    PaintLine,
+    surface_categories,
 )
 
 
@@ -131,3 +134,47 @@ class TestEnumAliases:
         """Testa que PaintLine é alias de Linha"""
         assert PaintLine is Linha
         assert PaintLine.PREMIUM == Linha.PREMIUM
+
+
+class TestPaintEnumColumns:
+    """Testes para o mapeamento das colunas enum de Paint"""
+    
+    @pytest.mark.parametrize("column", ["ambiente", "acabamento", "linha"])
+    def test_enum_column_is_not_native(self, column):
+        """Testa que os enums são gravados como VARCHAR, sem tipo ENUM nativo"""
+        column_type = Paint.__table__.c[column].type
+        
+        assert column_type.native_enum is False
+        assert column_type.length == 16
+    
+    def test_enum_column_rejects_unknown_string(self):
+        """Testa que strings fora do enum são rejeitadas no bind"""
+        process = Paint.__table__.c.ambiente.type.bind_processor(sqlite.dialect())
+        
+        assert process("Externo") == "EXTERNO"
+        with pytest.raises(LookupError):
+            process("Marte")
+
+
+class TestSurfaceCategories:
+    """Testes para a classificação de superfície definida no modelo"""
+    
+    @pytest.mark.parametrize("tipo_parede,expected", [
+        ("Madeira, Ferro", ["metal", "madeira"]),
+        ("Portão de aço", ["metal"]),
+        ("Alvenaria e gesso", ["parede"]),
+        (None, []),
+    ])
+    def test_surface_categories(self, tipo_parede, expected):
+        """Testa as categorias extraídas de tipo_parede (sem acento/caixa)"""
+        assert surface_categories(tipo_parede) == expected
+    
+    def test_column_default_classifies_tipo_parede(self):
+        """Testa o default de categorias_superficie a partir dos parâmetros do INSERT"""
+        class _Context:
+            def get_current_parameters(self):
+                return {"tipo_parede": "MDF e metal"}
+        
+        default = Paint.__table__.c.categorias_superficie.default
+        
+        assert default.arg(_Context()) == ["metal", "madeira"]
@@ -0,0 +1,279 @@
+"""Testes unitários para repositório de tintas"""
+import pytest
+from unittest.mock import Mock
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+from app.repositories.paint_repository import PaintRepository
+from app.models.paint import Paint, Ambiente, Acabamento
+
+
+def _mock_colors_db(rows):
+    """Cria mock de Session cuja consulta de cores retorna `rows`"""
+    mock_db = Mock()
+    mock_db.get_bind.return_value.url = "postgresql://test/colors"
+    mock_query = Mock()
+    mock_db.query.return_value = mock_query
+    mock_query.filter.return_value = mock_query
+    mock_query.group_by.return_value = mock_query
+    mock_query.order_by.return_value = mock_query
+    mock_query.all.return_value = rows
+    return mock_db
+
+
+class TestPaintRepositoryColorsCache:
+    """Testes para o cache de get_available_colors"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        PaintRepository.clear_colors_cache()
+        yield
+        PaintRepository.clear_colors_cache()
+
+    def test_get_available_colors_formats_rows(self):
+        """Testa formatação das cores retornadas pelo banco"""
+        mock_db = _mock_colors_db([("Azul", 3), ("Branco", 2), (None, 1)])
+
+        result = PaintRepository.get_available_colors(mock_db)
+
+        assert result == [
+            {"cor": "azul", "cor_display": "Azul", "count": 3},
+            {"cor": "branco", "cor_display": "Branco", "count": 2},
+        ]
+
+    def test_get_available_colors_uses_cache(self):
+        """Testa que a segunda chamada não consulta o banco"""
+        mock_db = _mock_colors_db([("Azul", 3)])
+
+        first = PaintRepository.get_available_colors(mock_db)
+        second = PaintRepository.get_available_colors(mock_db)
+
+        assert first == second
+        mock_db.query.assert_called_once()
+
+    def test_clear_colors_cache_forces_new_query(self):
+        """Testa que a invalidação faz a próxima chamada consultar o banco"""
+        mock_db = _mock_colors_db([("Azul", 3)])
+
+        PaintRepository.get_available_colors(mock_db)
+        PaintRepository.clear_colors_cache()
+        PaintRepository.get_available_colors(mock_db)
+
+        assert mock_db.query.call_count == 2
+
+    def test_delete_invalidates_cache(self):
+        """Testa que o soft delete invalida o cache de cores"""
+        mock_db = _mock_colors_db([("Azul", 3)])
+        PaintRepository.get_available_colors(mock_db)
+        mock_db.execute.return_value.rowcount = 1
+
+        assert PaintRepository.delete(mock_db, 1) is True
+        PaintRepository.get_available_colors(mock_db)
+
+        assert mock_db.query.call_count == 2
+        mock_db.execute.assert_called_once()
+
+    def test_delete_missing_keeps_cache(self):
+        """Testa que o soft delete sem linha afetada retorna False e mantém o cache"""
+        mock_db = _mock_colors_db([("Azul", 3)])
+        PaintRepository.get_available_colors(mock_db)
+        mock_db.execute.return_value.rowcount = 0
+
+        assert PaintRepository.delete(mock_db, 999) is False
+        PaintRepository.get_available_colors(mock_db)
+
+        assert mock_db.query.call_count == 1
+
+
+class TestPaintRepositoryKeywordParsing:
+    """Testes para interpretação de ambiente, acabamento e superfície"""
+
+    @pytest.mark.parametrize("text,expected", [
+        ("Interno", [Ambiente.INTERNO, Ambiente.INTERNO_EXTERNO]),
+        ("área externa", [Ambiente.EXTERNO, Ambiente.INTERNO_EXTERNO]),
+        ("fachada", [Ambiente.EXTERNO, Ambiente.INTERNO_EXTERNO]),
+        ("quarto", None),
+        (None, None),
+    ])
+    def test_parse_environment_filter(self, text, expected):
+        """Testa conversão de texto de ambiente em enums"""
+        assert PaintRepository._parse_environment_filter(text) == expected
+
+    @pytest.mark.parametrize("text,expected", [
+        ("Fosco", Acabamento.FOSCO),
+        ("semi-brilho", Acabamento.ACETINADO),
+        ("Brilhante", Acabamento.BRILHANTE),
+        ("texturizado", None),
+    ])
+    def test_parse_finish(self, text, expected):
+        """Testa conversão de texto de acabamento em enum"""
+        assert PaintRepository._parse_finish(text) == expected
+
+    def test_surface_keywords_unknown_surface(self):
+        """Testa superfície sem sinônimos conhecidos"""
+        assert PaintRepository._surface_keywords("Vidro") == ["vidro"]
+        assert PaintRepository._surface_keywords("") == []
+
+    @pytest.mark.parametrize("text,expected", [
+        ("FACHADA em MADEIRA", {"env_externo", "surf_madeira"}),
+        (None, set()),
+        ("Semi-Brilho", {"fin_acetinado", "fin_brilhante"}),
+    ])
+    def test_classify_is_case_insensitive(self, text, expected):
+        """Testa classificação sem normalizar caixa antes"""
+        assert PaintRepository._classify(text) == expected
+
+    def test_classify_ignores_accents(self):
+        """Testa que acentos e caixa não afetam a classificação"""
+        assert PaintRepository._classify("PORTÃO DE AÇO") == {"surf_metal"}
+        assert PaintRepository._classify("aco inox") == {"surf_metal"}
+
+    @pytest.mark.parametrize("tipo_parede,expected", [
+        ("Alvenaria", ["parede"]),
+        ("Madeira, Ferro", ["metal", "madeira"]),
+        ("Cerâmica", []),
+        (None, []),
+    ])
+    def test_surface_categories(self, tipo_parede, expected):
+        """Testa categorias de superfície pré-calculadas a partir de tipo_parede"""
+        assert PaintRepository.surface_categories(tipo_parede) == expected
+
+    def test_escape_like_wildcards(self):
+        """Testa escape de curingas para busca LIKE literal"""
+        assert PaintRepository._escape_like("azul_100%") == "azul\\_100\\%"
+
+
+class TestPaintRepositoryRecommendCandidates:
+    """Testes para o SQL montado por recommend_candidates"""
+
+    @staticmethod
+    def _recommend_sql(**filters):
+        """SQL (Postgres, valores literais) executado por recommend_candidates"""
+        session = Mock()
+        mock_db = Mock()
+        mock_db.query.side_effect = lambda *entities: Query(entities, session=session)
+
+        PaintRepository.recommend_candidates(mock_db, **filters)
+
+        stmt = session.execute.call_args[0][0]
+        return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    @pytest.mark.parametrize("surface_type,category", [
+        ("Aço galvanizado", "metal"),
+        ("MDF", "madeira"),
+        ("parede de gesso", "parede"),
+    ])
+    def test_known_surface_filters_by_category(self, surface_type, category):
+        """Testa que sinônimos de superfície filtram por categorias_superficie (índice GIN)"""
+        sql = self._recommend_sql(surface_type=surface_type)
+
+        assert f"paints.categorias_superficie @> ARRAY['{category}']" in sql
+        assert "paints.tipo_parede ILIKE" not in sql
+
+    def test_unknown_surface_falls_back_to_ilike(self):
+        """Testa que superfície sem categoria conhecida usa substring em tipo_parede"""
+        sql = self._recommend_sql(surface_type="Vidro")
+
+        assert "paints.tipo_parede ILIKE '%%vidro%%'" in sql
+        assert "categorias_superficie" not in sql
+
+
+class TestPaintRepositoryFindByColor:
+    """Testes para find_by_color (prefixo com fallback por substring)"""
+
+    @staticmethod
+    def _find(rows_per_query, cor):
+        """Executa find_by_color; cada consulta devolve o próximo item de `rows_per_query`"""
+        session = Mock()
+        session.execute.side_effect = [
+            Mock(**{"scalars.return_value.unique.return_value.all.return_value": rows})
+            for rows in rows_per_query
+        ]
+        mock_db = Mock()
+        mock_db.query.side_effect = lambda *entities: Query(entities, session=session)
+
+        result = PaintRepository.find_by_color(mock_db, cor)
+
+        sql = [
+            str(call[0][0].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            for call in session.execute.call_args_list
+        ]
+        return result, sql
+
+    def test_prefix_match_skips_substring_query(self):
+        """Testa que a cor base casa pelo prefixo, em uma única consulta"""
+        paint = Mock()
+
+        result, sql = self._find([[paint]], "Azul")
+
+        assert result == [paint]
+        assert len(sql) == 1
+        assert "lower(paints.cor) LIKE 'azul%%'" in sql[0]
+
+    def test_mid_name_term_falls_back_to_substring(self):
+        """Testa que termos do meio do nome ("claro") caem no ILIKE por substring"""
+        paint = Mock()
+
+        result, sql = self._find([[], [paint]], "claro")
+
+        assert result == [paint]
+        assert len(sql) == 2
+        assert "paints.cor ILIKE '%%claro%%'" in sql[1]
+        assert "lower(paints.cor) LIKE" not in sql[1]
+
+
+class TestPaintRepositoryWriteReturning:
+    """Testes para create/update com RETURNING"""
+
+    @pytest.fixture
+    def returned_db(self):
+        """Sessão mockada cujo RETURNING devolve uma tinta com as listas"""
+        paint = Paint(id=1, nome="Tinta Teste", features="Lavável, Sem odor", tipo_parede="Parede")
+        mock_db = Mock()
+        mock_db.execute.return_value.one_or_none.return_value = (paint, ["Lavável", "Sem odor"], ["Parede"])
+        return mock_db, paint
+
+    def test_create_detaches_paint_before_commit(self, returned_db):
+        """Testa que a tinta sai da sessão antes do commit (sem SELECT de recarga)"""
+        mock_db, paint = returned_db
+
+        result = PaintRepository.create(mock_db, {"nome": "Tinta Teste"}, created_by=1)
+
+        assert result is paint
+        assert [call[0] for call in mock_db.method_calls] == ["execute", "expunge", "commit"]
+        mock_db.expunge.assert_called_once_with(paint)
+
+    def test_update_loads_lists_from_returning(self, returned_db):
+        """Testa que as listas calculadas vêm do próprio RETURNING"""
+        mock_db, paint = returned_db
+
+        result = PaintRepository.update(mock_db, 1, {"features": "Lavável, Sem odor"})
+
+        assert result.features_list == ["Lavável", "Sem odor"]
+        assert result.aplicacao_list == ["Parede"]
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("UPDATE paints") and "RETURNING" in sql
+        assert "regexp_split_to_array" in sql
+
+    def test_update_missing_paint_returns_none(self):
+        """Testa que UPDATE sem linha afetada retorna None e não desanexa nada"""
+        mock_db = Mock()
+        mock_db.execute.return_value.one_or_none.return_value = None
+
+        assert PaintRepository.update(mock_db, 999, {"nome": "X"}) is None
+        mock_db.expunge.assert_not_called()
+        mock_db.commit.assert_called_once()
+
+
+class TestPaintRepositoryGetAll:
+    """Testes para get_all (lambda_stmt)"""
+
+    def test_search_uses_full_text_clause_with_current_term(self):
+        """Testa que a busca usa _search_clause e o termo de cada chamada (cache do lambda)"""
+        mock_db = Mock()
+        compiled = []
+        for term in ("azul", "verde"):
+            PaintRepository.get_all(mock_db, search=term)
+            compiled.append(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+
+        assert all("paints.search_vector @@ plainto_tsquery(" in str(c) for c in compiled)
+        assert [c.params["search_1"] for c in compiled] == ["azul", "verde"]
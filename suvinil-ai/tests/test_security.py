@@ -1,10 +1,14 @@
 """Testes unitários para módulo de segurança"""
+import time
 import pytest
 from datetime import timedelta
-from jose import jwt
+import jwt
 from app.core.security import (
+    pwd_context,
     get_password_hash,
+    get_password_hash_fast,
     verify_password,
+    verify_and_update_password,
     create_access_token,
     decode_access_token
 )
@@ -14,21 +18,19 @@ from app.core.config import settings
 class TestPasswordHashing:
     """Testes para hash de senhas"""
     
-    def test_get_password_hash_creates_hash(self):
+    def test_get_password_hash_creates_hash(self, hashed_secure_password):
         """Testa se get_password_hash cria um hash válido"""
-        password = "SecurePassword123!"
-        hashed = get_password_hash(password)
+        hashed = hashed_secure_password
         
         assert hashed is not None
-        assert hashed != password
+        assert hashed != "SecurePassword123!"
         assert len(hashed) > 0
-        assert hashed.startswith("$2b$")  # bcrypt prefix
+        assert hashed.startswith("$argon2id$")  # argon2id prefix
     
-    def test_get_password_hash_strips_whitespace(self):
+    def test_get_password_hash_strips_whitespace(self, hashed_secure_password):
         """Testa se get_password_hash remove espaços em branco"""
-        password = "  SecurePassword123!  "
-        hashed1 = get_password_hash(password)
-        hashed2 = get_password_hash(password.strip())
+        hashed1 = get_password_hash("  SecurePassword123!  ")
+        hashed2 = hashed_secure_password
         
         # Ambos devem gerar hashes válidos para a mesma senha sem espaços
         assert verify_password("SecurePassword123!", hashed1)
@@ -42,31 +44,50 @@ class TestPasswordHashing:
         # Deve aceitar a senha truncada
         assert verify_password("a" * 72, hashed)
         assert hashed is not None
+    
+    def test_get_password_hash_fast_is_verifiable(self):
+        """Testa se o hash de seed (custo reduzido) é aceito por verify_password"""
+        hashed = get_password_hash_fast("admin123")
+        
+        assert hashed.startswith("$2b$04$")
+        assert verify_password("admin123", hashed)
 
 
 class TestPasswordVerification:
     """Testes para verificação de senhas"""
     
-    def test_verify_password_correct_password(self):
+    def test_verify_password_correct_password(self, hashed_secure_password):
         """Testa verificação com senha correta"""
-        password = "SecurePassword123!"
-        hashed = get_password_hash(password)
-        
-        assert verify_password(password, hashed) is True
+        assert verify_password("SecurePassword123!", hashed_secure_password) is True
     
-    def test_verify_password_incorrect_password(self):
+    def test_verify_password_incorrect_password(self, hashed_secure_password):
         """Testa verificação com senha incorreta"""
-        password = "SecurePassword123!"
-        hashed = get_password_hash(password)
-        
-        assert verify_password("WrongPassword", hashed) is False
+        assert verify_password("WrongPassword", hashed_secure_password) is False
     
-    def test_verify_password_strips_whitespace(self):
+    def test_verify_password_strips_whitespace(self, hashed_secure_password):
         """Testa se verify_password remove espaços em branco"""
-        password = "SecurePassword123!"
-        hashed = get_password_hash(password)
+        assert verify_password("  SecurePassword123!  ", hashed_secure_password) is True
+    
+    def test_verify_password_accepts_legacy_bcrypt_hash(self, legacy_bcrypt_hash):
+        """Testa se hashes bcrypt antigos continuam válidos e são marcados para rehash"""
+        assert verify_password("SecurePassword123!", legacy_bcrypt_hash) is True
+        assert pwd_context.needs_update(legacy_bcrypt_hash) is True
+    
+    def test_verify_and_update_skips_rehash_for_current_hash(self, hashed_secure_password):
+        """Testa que hash atual (argon2) não é recalculado no login"""
+        assert verify_and_update_password("SecurePassword123!", hashed_secure_password) == (True, None)
+    
+    def test_verify_and_update_rehashes_legacy_bcrypt(self, legacy_bcrypt_hash):
+        """Testa que hash bcrypt antigo gera novo hash argon2 após login válido"""
+        valid, new_hash = verify_and_update_password("  SecurePassword123!  ", legacy_bcrypt_hash)
         
-        assert verify_password("  SecurePassword123!  ", hashed) is True
+        assert valid is True
+        assert new_hash.startswith("$argon2id$")
+        assert verify_password("SecurePassword123!", new_hash)
+    
+    def test_verify_and_update_wrong_password(self, legacy_bcrypt_hash):
+        """Testa que senha incorreta não gera novo hash"""
+        assert verify_and_update_password("WrongPassword", legacy_bcrypt_hash) == (False, None)
 
 
 class TestJWTTokens:
@@ -96,6 +117,14 @@ class TestJWTTokens:
         assert token is not None
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         assert payload["sub"] == "testuser"
+        assert abs(payload["exp"] - (time.time() + 3600)) <= 5
+    
+    def test_create_access_token_does_not_mutate_input(self):
+        """Testa se create_access_token não altera o dict recebido"""
+        data = {"sub": "testuser"}
+        create_access_token(data)
+        
+        assert data == {"sub": "testuser"}
     
     def test_decode_access_token_valid(self):
         """Testa decodificação de token válido"""
@@ -0,0 +1,202 @@
+"""Testes unitários para o seed de tintas via CSV (caminho COPY do Postgres)"""
+import csv
+import importlib.util
+import io
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from app.models.paint import Acabamento, Ambiente, Linha
+
+
+SEED_SCRIPT = Path(__file__).resolve().parents[1] / "seed-db" / "seed_paints_from_csv.py"
+
+
+@pytest.fixture(scope="session")
+def seed_module():
+    """Script seed-db/seed_paints_from_csv.py carregado como módulo (a pasta não é pacote)"""
+    spec = importlib.util.spec_from_file_location("seed_paints_from_csv", SEED_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # Registrado antes de executar: o @dataclass resolve anotações pelo sys.modules
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _tinta(nome, cor="Branco", tipo_parede="Parede", linha=Linha.STANDARD, features=None):
+    """Tinta já convertida, no formato gerado por iter_tintas_from_csv"""
+    return {
+        "nome": nome,
+        "cor": cor,
+        "tipo_parede": tipo_parede,
+        "ambiente": Ambiente.INTERNO_EXTERNO,
+        "acabamento": Acabamento.ACETINADO,
+        "features": features,
+        "linha": linha,
+    }
+
+
+def _copy_db(rowcounts=None):
+    """Sessão mockada para o caminho COPY
+
+    O cursor guarda (comando COPY, linhas do CSV enviado) de cada copy_expert;
+    execute devolve o rowcount configurado para o primeiro verbo do SQL.
+    """
+    rowcounts = rowcounts or {}
+    copied = []
+    cursor = Mock()
+    cursor.copy_expert.side_effect = lambda sql, buf: copied.append(
+        (sql, list(csv.reader(io.StringIO(buf.getvalue()))))
+    )
+    mock_db = Mock()
+    mock_db.connection.return_value.connection.cursor.return_value = cursor
+    mock_db.execute.side_effect = lambda stmt, params=None: Mock(
+        rowcount=rowcounts.get(str(stmt).split(None, 1)[0], 0)
+    )
+    return mock_db, cursor, copied
+
+
+def _executed_sql(mock_db):
+    return [str(call.args[0]) for call in mock_db.execute.call_args_list]
+
+
+class TestCopyRow:
+    """Testes para _copy_row (linha enviada no COPY)"""
+
+    def test_enums_are_written_by_name(self, seed_module):
+        """Teste: Enums vão pelo nome (formato do Enum(native_enum=False))"""
+        row = seed_module._copy_row(_tinta("Tinta A", linha=Linha.PREMIUM))
+
+        assert row[4:6] == ["INTERNO_EXTERNO", "ACETINADO"]
+        assert row[7] == "PREMIUM"
+
+    def test_columns_follow_copy_columns(self, seed_module):
+        """Teste: Ordem dos valores é a de _COPY_COLUMNS"""
+        row = seed_module._copy_row(_tinta("Tinta A", cor="Azul", features="Lavável"))
+
+        assert dict(zip(seed_module._COPY_COLUMNS, row)) == {
+            "nome": "Tinta A",
+            "cor": "Azul",
+            "tipo_parede": "Parede",
+            "categorias_superficie": "{parede}",
+            "ambiente": "INTERNO_EXTERNO",
+            "acabamento": "ACETINADO",
+            "features": "Lavável",
+            "linha": "STANDARD",
+        }
+
+    @pytest.mark.parametrize("tipo_parede,expected", [
+        ("Parede", "{parede}"),
+        ("Madeira, Metal", "{metal,madeira}"),
+        (None, "{}"),
+    ])
+    def test_categorias_array_literal(self, seed_module, tipo_parede, expected):
+        """Teste: Categorias de superfície viram literal de array do Postgres"""
+        row = seed_module._copy_row(_tinta("Tinta A", tipo_parede=tipo_parede))
+
+        assert row[3] == expected
+
+    def test_missing_values_become_csv_null(self, seed_module):
+        """Teste: Campos None saem como campo vazio sem aspas (NULL no COPY csv)"""
+        data = _tinta("Tinta A", cor=None, tipo_parede=None, features=None)
+        buf = io.StringIO()
+
+        csv.writer(buf).writerow(seed_module._copy_row(data))
+
+        assert buf.getvalue() == "Tinta A,,,{},INTERNO_EXTERNO,ACETINADO,,STANDARD\r\n"
+
+
+class TestCopyStream:
+    """Testes para _copy_stream (lotes de COPY FROM STDIN)"""
+
+    def test_sends_batches_and_counts_rows(self, seed_module, monkeypatch):
+        """Teste: Divide em lotes de COPY_BATCH_SIZE, soma o total e fecha o cursor"""
+        monkeypatch.setattr(seed_module, "COPY_BATCH_SIZE", 2)
+        mock_db, cursor, copied = _copy_db()
+        rows = ([str(i), "x"] for i in range(5))
+
+        total = seed_module._copy_stream(mock_db, "paints", ("nome", "cor"), rows)
+
+        assert total == 5
+        assert [len(batch) for _, batch in copied] == [2, 2, 1]
+        assert copied[0][0] == "COPY paints (nome, cor) FROM STDIN WITH (FORMAT csv)"
+        cursor.close.assert_called_once()
+
+
+class TestCopyPaints:
+    """Testes para _copy_paints / _copy_paints_direct (contagens do SeedResult)"""
+
+    def test_direct_copy_skips_csv_duplicates(self, seed_module):
+        """Teste: Com --truncate, duplicatas do CSV são descartadas antes do COPY"""
+        mock_db, _, copied = _copy_db()
+        tintas = [_tinta("A"), _tinta("B"), _tinta("A"), _tinta("A", linha=Linha.PREMIUM)]
+
+        result = seed_module._copy_paints_direct(mock_db, tintas, admin_id=7)
+
+        assert result == seed_module.SeedResult(inserted=3, skipped=1, updated=0)
+        sql, rows = copied[0]
+        assert sql.startswith("COPY paints (") and sql.count(",") == 9
+        assert [row[0] for row in rows] == ["A", "B", "A"]
+        assert all(row[-2:] == ["t", "7"] for row in rows)
+
+    def test_staging_counts_existing_as_skipped(self, seed_module):
+        """Teste: Sem update_existing, as já existentes contam como puladas"""
+        # 5 linhas no CSV, 1 duplicata; das 4 distintas, 3 são novas
+        mock_db, _, copied = _copy_db({"DELETE": 1, "INSERT": 3})
+        tintas = [_tinta(nome) for nome in ("A", "B", "C", "D", "A")]
+
+        result = seed_module._copy_paints(mock_db, tintas, admin_id=1)
+
+        assert result == seed_module.SeedResult(inserted=3, skipped=2, updated=0)
+        assert copied[0][0].startswith("COPY _paints_stage (")
+        sql = _executed_sql(mock_db)
+        assert not any(s.startswith("UPDATE") for s in sql)
+        assert sql[-1] == "DROP TABLE _paints_stage"
+
+    def test_staging_counts_existing_as_updated(self, seed_module):
+        """Teste: Com update_existing, as já existentes contam como atualizadas"""
+        mock_db, _, _ = _copy_db({"DELETE": 1, "INSERT": 3})
+        tintas = [_tinta(nome) for nome in ("A", "B", "C", "D", "A")]
+
+        result = seed_module._copy_paints(mock_db, tintas, admin_id=1, update_existing=True)
+
+        assert result == seed_module.SeedResult(inserted=3, skipped=1, updated=1)
+        sql = _executed_sql(mock_db)
+        # UPDATE antes do INSERT: recém-inseridas não contam como atualizadas
+        update_at = next(i for i, s in enumerate(sql) if s.startswith("UPDATE"))
+        insert_at = next(i for i, s in enumerate(sql) if s.startswith("INSERT"))
+        assert update_at < insert_at
+
+
+class TestSeedPaintsCopyDispatch:
+    """Testes para a escolha do caminho COPY em seed_paints"""
+
+    @pytest.fixture
+    def postgres_db(self):
+        """Sessão mockada em Postgres/psycopg2, com o admin de id 1"""
+        mock_db, _, copied = _copy_db({"INSERT": 2})
+        dialect = mock_db.get_bind.return_value.dialect
+        dialect.name, dialect.driver = "postgresql", "psycopg2"
+        mock_db.query.return_value.filter.return_value.scalar.return_value = 1
+        return mock_db, copied
+
+    def test_truncate_clears_and_copies_directly(self, seed_module, postgres_db):
+        """Teste: --truncate esvazia a tabela e faz COPY direto em paints"""
+        mock_db, copied = postgres_db
+
+        result = seed_module.seed_paints(mock_db, [_tinta("A"), _tinta("B")], truncate=True)
+
+        assert result == seed_module.SeedResult(inserted=2, skipped=0, updated=0)
+        assert _executed_sql(mock_db) == ["TRUNCATE TABLE paints RESTART IDENTITY"]
+        assert copied[0][0].startswith("COPY paints (")
+
+    def test_without_truncate_uses_staging(self, seed_module, postgres_db):
+        """Teste: Sem --truncate, passa pela tabela de staging"""
+        mock_db, copied = postgres_db
+
+        result = seed_module.seed_paints(mock_db, [_tinta("A"), _tinta("B")])
+
+        assert result == seed_module.SeedResult(inserted=2, skipped=0, updated=0)
+        assert copied[0][0].startswith("COPY _paints_stage (")
@@ -1,29 +1,30 @@
 """Testes para os especialistas em tintas (Specialists)"""
 import pytest
 from unittest.mock import MagicMock, patch
-from sqlalchemy.orm import Session
-from app.ai.specialists import (
-    BaseSpecialist,
-    SurfaceExpert,
-    ExteriorExpert,
-    ColorExpert,
-    InteriorExpert,
-    SpecialistRecommendation,
-    get_all_specialists
-)
-from app.models.paint import PaintAmbiente, PaintAcabamento, PaintLinha
+from app.models.paint import PaintAmbiente
+
+
+# prompt_manager mockado uma única vez para o módulo inteiro
+pytestmark = pytest.mark.usefixtures("mock_prompts")
+
+
+@pytest.fixture(scope="session")
+def specialist_module():
+    """Módulo app.ai.specialists, importado só quando um teste de especialista roda
+
+    A importação puxa o repositório de tintas e o prompt_manager; coletar
+    este arquivo com -k filtrando outros testes não paga mais esse custo.
+    """
+    import app.ai.specialists
+    return app.ai.specialists
 
 
 class TestSpecialistRecommendation:
     """Testes para a classe SpecialistRecommendation"""
     
-    def test_initialization(self):
+    def test_initialization(self, specialist_module, paint_mock):
         """Teste: Inicialização da recomendação"""
-        paint_mock = MagicMock()
-        paint_mock.id = 1
-        paint_mock.nome = "Tinta Teste"
-        
-        rec = SpecialistRecommendation(
+        rec = specialist_module.SpecialistRecommendation(
             specialist_name="Test Specialist",
             reasoning="Teste de raciocínio",
             recommended_paints=[paint_mock],
@@ -39,13 +40,9 @@ class TestSpecialistRecommendation:
         assert len(rec.key_attributes) == 2
         assert len(rec.technical_warnings) == 1
     
-    def test_to_dict(self):
+    def test_to_dict(self, specialist_module, paint_mock):
         """Teste: Conversão para dicionário"""
-        paint_mock = MagicMock()
-        paint_mock.id = 1
-        paint_mock.nome = "Tinta Premium"
-        
-        rec = SpecialistRecommendation(
+        rec = specialist_module.SpecialistRecommendation(
             specialist_name="Expert",
             reasoning="Ótima escolha",
             recommended_paints=[paint_mock],
@@ -61,7 +58,7 @@ class TestSpecialistRecommendation:
         assert result['confidence'] == 0.9
         assert result['recommendations_count'] == 1
         assert result['paint_ids'] == [1]
-        assert result['recommendations'] == ["Tinta Premium"]
+        assert result['recommendations'] == ["Tinta Teste"]
         assert result['warnings'] == []
         assert "Durabilidade" in result['key_attributes']
 
@@ -69,345 +66,234 @@ class TestSpecialistRecommendation:
 class TestBaseSpecialist:
     """Testes para a classe base BaseSpecialist"""
     
-    @pytest.fixture
-    def mock_db(self):
-        """Fixture para sessão mockada"""
-        return MagicMock(spec=Session)
-    
-    @pytest.fixture
-    def sample_paint(self):
-        """Fixture para tinta de exemplo"""
-        paint = MagicMock()
-        paint.id = 1
-        paint.nome = "Tinta Standard"
-        paint.cor = "Branco"
-        paint.ambiente = PaintAmbiente.INTERNO
-        paint.tipo_parede = "Parede"
-        paint.acabamento = PaintAcabamento.FOSCO
-        paint.features = "Lavável"
-        paint.linha = PaintLinha.STANDARD
-        return paint
-    
-    def test_initialization(self, mock_db):
+    def test_initialization(self, specialist_module, mock_db):
         """Teste: Inicialização do especialista base"""
-        specialist = BaseSpecialist(mock_db)
+        specialist = specialist_module.BaseSpecialist(mock_db)
         
         assert specialist.db == mock_db
         assert specialist.repository is not None
     
-    def test_can_help_default(self, mock_db):
+    def test_can_help_default(self, specialist_module, mock_db):
         """Teste: can_help retorna True por padrão"""
-        specialist = BaseSpecialist(mock_db)
+        specialist = specialist_module.BaseSpecialist(mock_db)
         
         assert specialist.can_help({}) is True
     
-    def test_get_base_candidates(self, mock_db, sample_paint):
+    def test_get_base_candidates(self, specialist_module, mock_db, sample_paint, monkeypatch):
         """Teste: Recuperação de candidatos base"""
-        specialist = BaseSpecialist(mock_db)
+        specialist = specialist_module.BaseSpecialist(mock_db)
+        
+        monkeypatch.setattr(
+            specialist.repository, 'recommend_candidates',
+            staticmethod(lambda db, **filters: [sample_paint]),
+        )
+        context = {
+            "ambiente": "interno",
+            "tipo_parede": "parede",
+            "cor": "branco",
+            "acabamento": "fosco"
+        }
+        
+        candidates = specialist._get_base_candidates(context)
         
-        with patch.object(specialist.repository, 'recommend_candidates', return_value=[sample_paint]):
-            context = {
-                "ambiente": "interno",
-                "tipo_parede": "parede",
-                "cor": "branco",
-                "acabamento": "fosco"
-            }
-            
-            candidates = specialist._get_base_candidates(context)
-            
-            assert len(candidates) == 1
-            assert candidates[0].nome == "Tinta Standard"
+        assert len(candidates) == 1
+        assert candidates[0] is sample_paint
 
 
 class TestSurfaceExpert:
     """Testes para o SurfaceExpert (Especialista em Superfícies)"""
     
-    @pytest.fixture
-    def mock_db(self):
-        return MagicMock(spec=Session)
-    
-    @pytest.fixture
-    def mock_prompts(self):
-        """Mock do prompt manager"""
-        with patch('app.ai.specialists.prompt_manager') as mock:
-            mock.get_specialist_prompts.return_value = {
-                'surface_expert': {
-                    'reasoning_template': 'Para aplicar em {surface}, a {product_name} é compatível.'
-                }
-            }
-            yield mock
-    
-    def test_can_help_with_wood(self, mock_db, mock_prompts):
-        """Teste: Identifica que pode ajudar com madeira"""
-        expert = SurfaceExpert(mock_db)
-        
-        context = {"tipo_parede": "madeira"}
-        assert expert.can_help(context) is True
-    
-    def test_can_help_with_metal(self, mock_db, mock_prompts):
-        """Teste: Identifica que pode ajudar com metal"""
-        expert = SurfaceExpert(mock_db)
-        
-        context = {"tipo_parede": "metal"}
-        assert expert.can_help(context) is True
-    
-    def test_can_help_with_wall(self, mock_db, mock_prompts):
-        """Teste: Identifica que pode ajudar com parede"""
-        expert = SurfaceExpert(mock_db)
-        
-        context = {"tipo_parede": "parede"}
-        assert expert.can_help(context) is True
-    
-    def test_cannot_help_without_surface(self, mock_db, mock_prompts):
-        """Teste: Não ajuda sem tipo de superfície"""
-        expert = SurfaceExpert(mock_db)
-        
-        context = {"ambiente": "interno"}
-        assert expert.can_help(context) is False
-    
-    def test_analyze_with_matching_paint(self, mock_db, mock_prompts):
-        """Teste: Análise com tinta compatível"""
-        expert = SurfaceExpert(mock_db)
-        
-        paint = MagicMock()
-        paint.id = 1
-        paint.nome = "Tinta para Madeira"
-        paint.tipo_parede = "Madeira, MDF"
-        paint.cor = "Branco"
-        
-        with patch.object(expert, '_get_base_candidates', return_value=[paint]):
-            context = {
-                "tipo_parede": "madeira",
-                "cor": "branco"
-            }
-            
-            rec = expert.analyze(context)
-            
-            assert rec is not None
-            assert rec.specialist_name == expert.name
-            assert "madeira" in rec.reasoning.lower()
-            assert len(rec.recommended_paints) == 1
-            assert rec.confidence == 0.93
+    @pytest.mark.parametrize("context,expected", [
+        ({"tipo_parede": "madeira"}, True),
+        ({"tipo_parede": "metal"}, True),
+        ({"tipo_parede": "parede"}, True),
+        # Sem tipo de superfície não ajuda
+        ({"ambiente": "interno"}, False),
+    ])
+    def test_can_help(self, surface_expert, context, expected):
+        """Teste: Identifica quando pode ajudar pelo tipo de superfície"""
+        assert surface_expert.can_help(context) is expected
 
 
 class TestExteriorExpert:
     """Testes para o ExteriorExpert (Especialista em Áreas Externas)"""
     
-    @pytest.fixture
-    def mock_db(self):
-        return MagicMock(spec=Session)
-    
-    @pytest.fixture
-    def mock_prompts(self):
-        with patch('app.ai.specialists.prompt_manager') as mock:
-            mock.get_specialist_prompts.return_value = {
-                'exterior_expert': {
-                    'reasoning_with_color': 'Para sua varanda, recomendo a {product_name} na cor {color}.',
-                    'reasoning_no_color': 'Não encontrei {cor_solicitada}. Temos {product_name} ({color}).',
-                    'warning_no_color': "Cor '{cor_solicitada}' não disponível"
-                }
-            }
-            yield mock
-    
-    def test_can_help_with_external(self, mock_db, mock_prompts):
-        """Teste: Identifica ambiente externo"""
-        expert = ExteriorExpert(mock_db)
+    @pytest.mark.parametrize("context,expected", [
+        ({"ambiente": "externo"}, True),
+        ({"tipo_parede": "fachada"}, True),
+        ({"ambiente": "interno"}, False),
+    ])
+    def test_can_help(self, exterior_expert, context, expected):
+        """Teste: Identifica ambiente externo ou fachada"""
+        assert exterior_expert.can_help(context) is expected
+    
+    def test_analyze_color_missing_retries_without_color(self, specialist_module, mock_db, paint_stub):
+        """Teste: Sem a cor no banco, busca de novo sem cor e avisa o usuário"""
+        expert = specialist_module.ExteriorExpert(mock_db)
         
-        context = {"ambiente": "externo"}
-        assert expert.can_help(context) is True
-    
-    def test_can_help_with_facade(self, mock_db, mock_prompts):
-        """Teste: Identifica fachada"""
-        expert = ExteriorExpert(mock_db)
-        
-        context = {"tipo_parede": "fachada"}
-        assert expert.can_help(context) is True
-    
-    def test_cannot_help_with_internal(self, mock_db, mock_prompts):
-        """Teste: Não ajuda com ambiente interno"""
-        expert = ExteriorExpert(mock_db)
-        
-        context = {"ambiente": "interno"}
-        assert expert.can_help(context) is False
-    
-    def test_analyze_with_external_paint(self, mock_db, mock_prompts):
-        """Teste: Análise com tinta externa"""
-        expert = ExteriorExpert(mock_db)
+        paint = paint_stub(
+            id=1,
+            nome="Tinta Fachada Premium",
+            cor="Branco",
+            ambiente=PaintAmbiente.EXTERNO,
+            tipo_parede="Parede",
+        )
         
-        paint = MagicMock()
-        paint.id = 1
-        paint.nome = "Tinta Fachada Premium"
-        paint.cor = "Branco"
-        paint.ambiente = PaintAmbiente.EXTERNO
-        paint.tipo_parede = "Parede"
-        paint.features = "Proteção UV, resistente ao sol"
+        with patch.object(expert.repository, 'recommend_candidates', side_effect=[[], [paint]]) as mock_rc:
+            rec = expert.analyze({"ambiente": "externo", "cor": "roxo"})
         
-        with patch.object(expert, '_get_base_candidates', return_value=[paint]):
-            context = {
-                "ambiente": "externo",
-                "cor": "branco"
-            }
-            
-            rec = expert.analyze(context)
-            
-            assert rec is not None
-            assert rec.confidence == 0.98
-            assert "UV" in rec.key_attributes or "chuva" in str(rec.key_attributes).lower()
+        assert mock_rc.call_args_list[0].kwargs["color"] == "roxo"
+        assert mock_rc.call_args_list[1].kwargs["color"] is None
+        assert rec.confidence == 0.7
+        assert rec.technical_warnings == ["Cor 'roxo' não disponível"]
 
 
 class TestColorExpert:
     """Testes para o ColorExpert (Especialista em Cores)"""
     
-    @pytest.fixture
-    def mock_db(self):
-        return MagicMock(spec=Session)
-    
-    @pytest.fixture
-    def mock_prompts(self):
-        with patch('app.ai.specialists.prompt_manager') as mock:
-            mock.get_specialist_prompts.return_value = {
-                'color_expert': {
-                    'no_match_reasoning': 'A cor {cor} é excelente para {ambiente}.'
-                },
-                'color_insights': {
-                    'azul': 'Azul transmite calma e serenidade.',
-                    'verde': 'Verde traz frescor e natureza.',
-                    'default': 'A cor {cor} cria uma atmosfera única.'
-                }
-            }
-            yield mock
-    
-    def test_can_help_with_color(self, mock_db, mock_prompts):
-        """Teste: Identifica que há cor especificada"""
-        expert = ColorExpert(mock_db)
-        
-        context = {"cor": "azul"}
-        assert expert.can_help(context) is True
-    
-    def test_cannot_help_without_color(self, mock_db, mock_prompts):
-        """Teste: Não ajuda sem cor"""
-        expert = ColorExpert(mock_db)
-        
-        context = {"ambiente": "interno"}
-        assert expert.can_help(context) is False
-    
-    def test_analyze_with_matching_color(self, mock_db, mock_prompts):
-        """Teste: Análise com cor encontrada"""
-        expert = ColorExpert(mock_db)
-        
-        paint = MagicMock()
-        paint.id = 1
-        paint.nome = "Tinta Azul Celeste"
-        paint.cor = "Azul Celeste"
-        
-        with patch.object(expert, '_get_base_candidates', return_value=[paint]):
-            context = {"cor": "azul"}
-            
-            rec = expert.analyze(context)
-            
-            assert rec is not None
-            assert rec.confidence == 0.95
-            assert len(rec.recommended_paints) >= 1
+    @pytest.mark.parametrize("context,expected", [
+        ({"cor": "azul"}, True),
+        ({"ambiente": "interno"}, False),
+    ])
+    def test_can_help(self, color_expert, context, expected):
+        """Teste: Só ajuda quando há cor especificada"""
+        assert color_expert.can_help(context) is expected
 
 
 class TestInteriorExpert:
     """Testes para o InteriorExpert (Especialista em Ambientes Internos)"""
     
-    @pytest.fixture
-    def mock_db(self):
-        return MagicMock(spec=Session)
-    
-    @pytest.fixture
-    def mock_prompts(self):
-        with patch('app.ai.specialists.prompt_manager') as mock:
-            mock.get_specialist_prompts.return_value = {
-                'interior_expert': {
-                    'reasoning_with_color': 'Para o seu interior, recomendo a {product_name} na cor {color}.',
-                    'reasoning_no_color': 'Não encontrei {cor_solicitada}. Temos {product_name} ({color}).',
-                    'reasoning_no_products': 'Não encontrei tintas adequadas.',
-                    'warning_no_color': "Cor '{cor_solicitada}' não disponível"
-                }
-            }
-            yield mock
-    
-    def test_can_help_with_internal(self, mock_db, mock_prompts):
+    @pytest.mark.parametrize("context,expected", [
+        ({"ambiente": "interno"}, True),
+        ({"ambiente": "externo"}, False),
+    ])
+    def test_can_help(self, interior_expert, context, expected):
         """Teste: Identifica ambiente interno"""
-        expert = InteriorExpert(mock_db)
-        
-        context = {"ambiente": "interno"}
-        assert expert.can_help(context) is True
-    
-    def test_cannot_help_with_external(self, mock_db, mock_prompts):
-        """Teste: Não ajuda com ambiente externo"""
-        expert = InteriorExpert(mock_db)
-        
-        context = {"ambiente": "externo"}
-        assert expert.can_help(context) is False
-    
-    def test_analyze_prioritizes_health_features(self, mock_db, mock_prompts):
-        """Teste: Prioriza características de saúde (sem odor, lavável)"""
-        expert = InteriorExpert(mock_db)
-        
-        paint1 = MagicMock()
-        paint1.id = 1
-        paint1.nome = "Tinta Básica"
-        paint1.cor = "Branco"
-        paint1.ambiente = PaintAmbiente.INTERNO
-        paint1.features = ""
+        assert interior_expert.can_help(context) is expected
+
+    def test_analyze_color_only_in_discarded_paints(self, specialist_module, mock_db, paint_stub):
+        """Teste: Cor existe só em tinta externa; busca de novo sem cor em vez de retornar None"""
+        expert = specialist_module.InteriorExpert(mock_db)
+        red_exterior = paint_stub(id=1, nome="Tinta Fachada", cor="Vermelho", ambiente=PaintAmbiente.EXTERNO)
+        white_interior = paint_stub(id=2, nome="Tinta Quarto", cor="Branco", ambiente=PaintAmbiente.INTERNO)
+
+        with patch.object(
+            expert.repository, 'recommend_candidates', side_effect=[[red_exterior], [white_interior]]
+        ) as mock_rc:
+            rec = expert.analyze({"cor": "vermelho"})
+
+        assert mock_rc.call_args_list[1].kwargs["color"] is None
+        assert rec.recommended_paints == [white_interior]
+        assert rec.confidence == 0.7
+        assert rec.technical_warnings == ["Cor 'vermelho' não disponível"]
+
+
+# Cenários de analyze com _get_base_candidates mockado:
+# (especialista, tintas candidatas, contexto, confiança, tinta no topo, verificação extra)
+ANALYZE_SCENARIOS = {
+    "surface": (
+        "surface_expert",
+        [{"id": 1, "nome": "Tinta para Madeira", "tipo_parede": "Madeira, MDF", "cor": "Branco"}],
+        {"tipo_parede": "madeira", "cor": "branco"},
+        0.93,
+        "Tinta para Madeira",
+        lambda rec: "madeira" in rec.reasoning.lower() and len(rec.recommended_paints) == 1,
+    ),
+    "exterior": (
+        "exterior_expert",
+        [{"id": 1, "nome": "Tinta Fachada Premium", "cor": "Branco", "ambiente": PaintAmbiente.EXTERNO,
+          "tipo_parede": "Parede", "features": "Proteção UV, resistente ao sol"}],
+        {"ambiente": "externo", "cor": "branco"},
+        0.98,
+        "Tinta Fachada Premium",
+        lambda rec: "UV" in rec.key_attributes or "chuva" in str(rec.key_attributes).lower(),
+    ),
+    "color": (
+        "color_expert",
+        [{"id": 1, "nome": "Tinta Azul Celeste", "cor": "Azul Celeste"}],
+        {"cor": "azul"},
+        0.95,
+        "Tinta Azul Celeste",
+        lambda rec: len(rec.recommended_paints) >= 1,
+    ),
+    # Interior prioriza características de saúde (sem odor, lavável):
+    # a tinta com mais features deve vir primeiro
+    "interior": (
+        "interior_expert",
+        [
+            {"id": 1, "nome": "Tinta Básica", "cor": "Branco", "ambiente": PaintAmbiente.INTERNO,
+             "features": ""},
+            {"id": 2, "nome": "Tinta Premium Sem Odor", "cor": "Branco", "ambiente": PaintAmbiente.INTERNO,
+             "features": "Sem odor, Lavável"},
+        ],
+        {"ambiente": "interno", "cor": "branco"},
+        0.9,
+        "Tinta Premium Sem Odor",
+        lambda rec: "Sem Odor" in rec.key_attributes or "Lavável" in rec.key_attributes,
+    ),
+}
+
+
+class TestSpecialistAnalyze:
+    """Testes de analyze comuns a todos os especialistas"""
+    
+    @pytest.fixture(params=list(ANALYZE_SCENARIOS), ids=list(ANALYZE_SCENARIOS))
+    def analyze_scenario(self, request, monkeypatch, paint_stub):
+        """Especialista pronto para analyze, com as tintas candidatas já injetadas"""
+        expert_fixture, paints_data, context, confidence, top_paint, check = ANALYZE_SCENARIOS[request.param]
+        expert = request.getfixturevalue(expert_fixture)
+        paints = [paint_stub(**data) for data in paints_data]
+        monkeypatch.setattr(expert, '_get_base_candidates', lambda context, with_color=True: list(paints))
+        return expert, context, confidence, top_paint, check
+    
+    def test_analyze(self, analyze_scenario):
+        """Teste: Análise retorna a recomendação esperada para cada especialista"""
+        expert, context, confidence, top_paint, check = analyze_scenario
         
-        paint2 = MagicMock()
-        paint2.id = 2
-        paint2.nome = "Tinta Premium Sem Odor"
-        paint2.cor = "Branco"
-        paint2.ambiente = PaintAmbiente.INTERNO
-        paint2.features = "Sem odor, Lavável"
+        rec = expert.analyze(context)
         
-        with patch.object(expert, '_get_base_candidates', return_value=[paint1, paint2]):
-            context = {
-                "ambiente": "interno",
-                "cor": "branco"
-            }
-            
-            rec = expert.analyze(context)
-            
-            assert rec is not None
-            # O paint2 deve estar primeiro por ter mais features
-            assert rec.recommended_paints[0].nome == "Tinta Premium Sem Odor"
-            assert "Sem Odor" in rec.key_attributes or "Lavável" in rec.key_attributes
+        assert rec is not None
+        assert rec.specialist_name == expert.name
+        assert rec.confidence == confidence
+        assert rec.recommended_paints[0].nome == top_paint
+        assert check(rec)
 
 
 class TestGetAllSpecialists:
     """Testes para a factory de especialistas"""
     
-    @pytest.fixture
-    def mock_db(self):
-        return MagicMock(spec=Session)
+    @pytest.fixture(scope="class")
+    def specialists_db(self):
+        """Sessão mockada compartilhada pelos testes de leitura da classe"""
+        return MagicMock()
     
-    @pytest.fixture
-    def mock_prompts(self):
-        with patch('app.ai.specialists.prompt_manager') as mock:
-            mock.get_specialist_prompts.return_value = {
-                'surface_expert': {},
-                'exterior_expert': {},
-                'interior_expert': {},
-                'color_expert': {},
-                'color_insights': {}
-            }
-            yield mock
+    @pytest.fixture(scope="class")
+    def specialists_list(self, specialist_module, mock_prompts, specialists_db):
+        """Especialistas montados uma vez para os testes que só inspecionam a lista"""
+        return specialist_module.get_all_specialists(specialists_db)
     
-    def test_get_all_specialists(self, mock_db, mock_prompts):
+    def test_get_all_specialists(self, specialist_module, specialists_list):
         """Teste: Retorna todos os especialistas"""
-        specialists = get_all_specialists(mock_db)
+        specialists = specialists_list
         
         assert len(specialists) == 4
-        assert isinstance(specialists[0], SurfaceExpert)
-        assert isinstance(specialists[1], ExteriorExpert)
-        assert isinstance(specialists[2], InteriorExpert)
-        assert isinstance(specialists[3], ColorExpert)
+        assert isinstance(specialists[0], specialist_module.SurfaceExpert)
+        assert isinstance(specialists[1], specialist_module.ExteriorExpert)
+        assert isinstance(specialists[2], specialist_module.InteriorExpert)
+        assert isinstance(specialists[3], specialist_module.ColorExpert)
+    
+    def test_specialists_share_candidate_query(self, specialist_module, mock_db):
+        """Teste: Especialistas da mesma rodada consultam o banco uma única vez"""
+        specialists = specialist_module.get_all_specialists(mock_db)
+        context = {"ambiente": "interno", "cor": "azul"}
+        
+        with patch('app.ai.specialists.PaintRepository.recommend_candidates', return_value=[]) as mock_rc:
+            for specialist in specialists:
+                specialist._get_base_candidates(context)
+        
+        mock_rc.assert_called_once()
     
-    def test_all_specialists_have_db(self, mock_db, mock_prompts):
+    def test_all_specialists_have_db(self, specialists_list, specialists_db):
         """Teste: Todos especialistas têm referência ao DB"""
-        specialists = get_all_specialists(mock_db)
-        
-        for specialist in specialists:
-            assert specialist.db == mock_db
+        for specialist in specialists_list:
+            assert specialist.db is specialists_db
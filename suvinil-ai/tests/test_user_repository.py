@@ -6,104 +6,88 @@ from app.schemas.user import UserCreate, UserUpdate
 from app.models.user import User, UserRole
 
 
+# get_password_hash patcheado uma única vez para o módulo; quem verifica as
+# chamadas pede mock_hash, que zera o histórico antes de cada teste
+@pytest.fixture(autouse=True, scope="module")
+def patched_hash():
+    with patch('app.repositories.user_repository.get_password_hash', return_value="hashed_password") as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_hash(patched_hash):
+    patched_hash.reset_mock()
+    return patched_hash
+
+
+# Payloads validados uma vez por módulo: a validação dos schemas não é o que
+# se testa aqui, e o repositório só lê os campos
+@pytest.fixture(scope="module")
+def user_create_payload():
+    return UserCreate(
+        email="newuser@example.com",
+        username="newuser",
+        password="SecurePassword123!",
+        full_name="New User",
+        role=UserRole.USER
+    )
+
+
+@pytest.fixture(scope="module")
+def admin_create_payload():
+    return UserCreate(
+        email="admin@example.com",
+        username="admin",
+        password="AdminPass123!",
+        role=UserRole.ADMIN
+    )
+
+
+@pytest.fixture(scope="module")
+def user_update_payload():
+    return UserUpdate(email="new@example.com", full_name="New Name")
+
+
+@pytest.fixture(scope="module")
+def password_update_payload():
+    return UserUpdate(password="NewPassword123!")
+
+
 class TestUserRepositoryGetMethods:
     """Testes para métodos GET do repositório"""
     
-    def test_get_by_id_found(self):
-        """Testa busca de usuário por ID quando encontrado"""
-        mock_db = Mock()
-        mock_user = User(
-            id=1,
-            email="test@example.com",
-            username="testuser",
-            hashed_password="hashed",
-            is_active=True,
-            role=UserRole.USER
-        )
-        
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_user
-        
-        result = UserRepository.get_by_id(mock_db, 1)
-        
-        assert result is not None
-        assert result.id == 1
-        assert result.email == "test@example.com"
+    @pytest.mark.parametrize("method,arg,attr", [
+        ("get_by_id", 1, "id"),
+        ("get_by_email", "test@example.com", "email"),
+        ("get_by_username", "testuser", "username"),
+    ])
+    def test_get_by_attribute_found(self, mock_db_with_user, sample_user, method, arg, attr):
+        """Testa busca de usuário por ID/email/username quando encontrado"""
+        mock_db = mock_db_with_user
+        
+        result = getattr(UserRepository, method)(mock_db, arg)
+        
+        assert result is sample_user
+        assert getattr(result, attr) == arg
         mock_db.query.assert_called_once_with(User)
     
-    def test_get_by_id_not_found(self):
-        """Testa busca de usuário por ID quando não encontrado"""
-        mock_db = Mock()
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
+    @pytest.mark.parametrize("method,arg", [
+        ("get_by_id", 999),
+        ("get_by_email", "missing@example.com"),
+        ("get_by_username", "missing"),
+    ])
+    def test_get_by_attribute_not_found(self, query_mock, method, arg):
+        """Testa busca de usuário por ID/email/username quando não encontrado"""
+        mock_db = Mock(**{'query.return_value': query_mock(first=None)})
         
-        result = UserRepository.get_by_id(mock_db, 999)
+        result = getattr(UserRepository, method)(mock_db, arg)
         
         assert result is None
     
-    def test_get_by_email_found(self):
-        """Testa busca de usuário por email quando encontrado"""
-        mock_db = Mock()
-        mock_user = User(
-            id=1,
-            email="test@example.com",
-            username="testuser",
-            hashed_password="hashed",
-            is_active=True,
-            role=UserRole.USER
-        )
-        
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_user
-        
-        result = UserRepository.get_by_email(mock_db, "test@example.com")
-        
-        assert result is not None
-        assert result.email == "test@example.com"
-    
-    def test_get_by_username_found(self):
-        """Testa busca de usuário por username quando encontrado"""
-        mock_db = Mock()
-        mock_user = User(
-            id=1,
-            email="test@example.com",
-            username="testuser",
-            hashed_password="hashed",
-            is_active=True,
-            role=UserRole.USER
-        )
-        
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = mock_user
-        
-        result = UserRepository.get_by_username(mock_db, "testuser")
-        
-        assert result is not None
-        assert result.username == "testuser"
-    
-    def test_get_all_with_pagination(self):
+    def test_get_all_with_pagination(self, query_mock, sample_users):
         """Testa listagem de todos os usuários com paginação"""
-        mock_db = Mock()
-        mock_users = [
-            User(id=1, email="user1@example.com", username="user1", 
-                 hashed_password="hash1", is_active=True, role=UserRole.USER),
-            User(id=2, email="user2@example.com", username="user2", 
-                 hashed_password="hash2", is_active=True, role=UserRole.USER),
-        ]
-        
-        mock_query = Mock()
-        mock_db.query.return_value = mock_query
-        mock_query.offset.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = mock_users
+        mock_query = query_mock(all_=list(sample_users))
+        mock_db = Mock(**{'query.return_value': mock_query})
         
         result = UserRepository.get_all(mock_db, skip=0, limit=10)
         
@@ -117,52 +101,33 @@ class TestUserRepositoryGetMethods:
 class TestUserRepositoryCreateMethod:
     """Testes para método CREATE do repositório"""
     
-    @patch('app.repositories.user_repository.get_password_hash')
-    def test_create_user_success(self, mock_hash):
+    def test_create_user_success(self, mock_hash, user_create_payload):
         """Testa criação de usuário com sucesso"""
-        mock_hash.return_value = "hashed_password"
         mock_db = Mock()
         
-        user_data = UserCreate(
-            email="newuser@example.com",
-            username="newuser",
-            password="SecurePassword123!",
-            full_name="New User",
-            role=UserRole.USER
-        )
-        
         # Mock para simular o refresh que popula o ID
         def mock_refresh(user):
             user.id = 1
         
         mock_db.refresh.side_effect = mock_refresh
         
-        result = UserRepository.create(mock_db, user_data)
+        result = UserRepository.create(mock_db, user_create_payload)
         
         mock_db.add.assert_called_once()
         mock_db.commit.assert_called_once()
         mock_db.refresh.assert_called_once()
         mock_hash.assert_called_once_with("SecurePassword123!")
     
-    @patch('app.repositories.user_repository.get_password_hash')
-    def test_create_user_admin_role(self, mock_hash):
+    def test_create_user_admin_role(self, admin_create_payload):
         """Testa criação de usuário com role admin"""
-        mock_hash.return_value = "hashed_password"
         mock_db = Mock()
         
-        user_data = UserCreate(
-            email="admin@example.com",
-            username="admin",
-            password="AdminPass123!",
-            role=UserRole.ADMIN
-        )
-        
         def mock_refresh(user):
             user.id = 1
         
         mock_db.refresh.side_effect = mock_refresh
         
-        result = UserRepository.create(mock_db, user_data)
+        result = UserRepository.create(mock_db, admin_create_payload)
         
         mock_db.add.assert_called_once()
         mock_db.commit.assert_called_once()
@@ -171,67 +136,53 @@ class TestUserRepositoryCreateMethod:
 class TestUserRepositoryUpdateMethod:
     """Testes para método UPDATE do repositório"""
     
-    @patch('app.repositories.user_repository.get_password_hash')
-    def test_update_user_success(self, mock_hash):
+    def test_update_user_success(self, mock_hash, sample_user, user_update_payload):
         """Testa atualização de usuário com sucesso"""
-        mock_hash.return_value = "new_hashed_password"
-        mock_db = Mock()
-        mock_user = User(
-            id=1,
-            email="old@example.com",
-            username="olduser",
-            hashed_password="old_hash",
-            full_name="Old Name",
-            is_active=True,
-            role=UserRole.USER
-        )
+        mock_db = Mock(**{'execute.return_value.scalar_one_or_none.return_value': sample_user})
+        
+        result = UserRepository.update(mock_db, 1, user_update_payload)
         
-        # Mock get_by_id
-        with patch.object(UserRepository, 'get_by_id', return_value=mock_user):
-            update_data = UserUpdate(
-                email="new@example.com",
-                full_name="New Name"
-            )
-            
-            result = UserRepository.update(mock_db, 1, update_data)
-            
-            assert result is not None
-            mock_db.commit.assert_called_once()
-            mock_db.refresh.assert_called_once()
+        assert result is sample_user
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+        mock_hash.assert_not_called()
+        # Desanexado antes do commit para não ser expirado e recarregado
+        mock_db.expunge.assert_called_once_with(sample_user)
+        assert [call[0] for call in mock_db.method_calls][-2:] == ["expunge", "commit"]
     
     def test_update_user_not_found(self):
         """Testa atualização de usuário não encontrado"""
+        mock_db = Mock(**{'execute.return_value.scalar_one_or_none.return_value': None})
+        
+        update_data = UserUpdate(full_name="New Name")
+        
+        result = UserRepository.update(mock_db, 999, update_data)
+        
+        assert result is None
+        mock_db.expunge.assert_not_called()
+    
+    def test_update_user_empty_data_only_loads(self, sample_user, monkeypatch):
+        """Testa que atualização sem campos não emite UPDATE"""
         mock_db = Mock()
         
-        with patch.object(UserRepository, 'get_by_id', return_value=None):
-            update_data = UserUpdate(full_name="New Name")
-            
-            result = UserRepository.update(mock_db, 999, update_data)
-            
-            assert result is None
-            mock_db.commit.assert_not_called()
+        monkeypatch.setattr(UserRepository, 'get_by_id', staticmethod(lambda db, user_id: sample_user))
+        result = UserRepository.update(mock_db, 1, UserUpdate())
+        
+        assert result is sample_user
+        mock_db.execute.assert_not_called()
+        mock_db.commit.assert_not_called()
     
-    @patch('app.repositories.user_repository.get_password_hash')
-    def test_update_user_password(self, mock_hash):
+    def test_update_user_password(self, mock_hash, password_update_payload):
         """Testa atualização de senha do usuário"""
-        mock_hash.return_value = "new_hashed_password"
         mock_db = Mock()
-        mock_user = User(
-            id=1,
-            email="user@example.com",
-            username="user",
-            hashed_password="old_hash",
-            is_active=True,
-            role=UserRole.USER
-        )
         
-        with patch.object(UserRepository, 'get_by_id', return_value=mock_user):
-            update_data = UserUpdate(password="NewPassword123!")
-            
-            result = UserRepository.update(mock_db, 1, update_data)
-            
-            mock_hash.assert_called_once_with("NewPassword123!")
-            mock_db.commit.assert_called_once()
+        UserRepository.update(mock_db, 1, password_update_payload)
+        
+        mock_hash.assert_called_once_with("NewPassword123!")
+        stmt = mock_db.execute.call_args[0][0]
+        assert stmt.compile().params["hashed_password"] == "hashed_password"
+        mock_db.commit.assert_called_once()
 
 
 class TestUserRepositoryDeleteMethod:
@@ -239,30 +190,22 @@ class TestUserRepositoryDeleteMethod:
     
     def test_delete_user_success(self):
         """Testa exclusão de usuário com sucesso"""
-        mock_db = Mock()
-        mock_user = User(
-            id=1,
-            email="delete@example.com",
-            username="deleteuser",
-            hashed_password="hash",
-            is_active=True,
-            role=UserRole.USER
-        )
+        mock_db = Mock(**{'execute.return_value.rowcount': 1})
+        
+        result = UserRepository.delete(mock_db, 1)
         
-        with patch.object(UserRepository, 'get_by_id', return_value=mock_user):
-            result = UserRepository.delete(mock_db, 1)
-            
-            assert result is True
-            mock_db.delete.assert_called_once_with(mock_user)
-            mock_db.commit.assert_called_once()
+        assert result is True
+        assert mock_db.execute.call_count == 2
+        mock_db.query.assert_not_called()
+        mock_db.delete.assert_not_called()
+        mock_db.commit.assert_called_once()
     
     def test_delete_user_not_found(self):
         """Testa exclusão de usuário não encontrado"""
-        mock_db = Mock()
+        mock_db = Mock(**{'execute.return_value.rowcount': 0})
+        
+        result = UserRepository.delete(mock_db, 999)
         
-        with patch.object(UserRepository, 'get_by_id', return_value=None):
-            result = UserRepository.delete(mock_db, 999)
-            
-            assert result is False
-            mock_db.delete.assert_not_called()
-            mock_db.commit.assert_not_called()
+        assert result is False
+        mock_db.rollback.assert_called_once()
+        mock_db.commit.assert_not_called()
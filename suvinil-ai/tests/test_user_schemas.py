@@ -12,12 +12,39 @@ from app.schemas.user import (
 from app.models.user import UserRole
 
 
+# Instâncias válidas montadas uma vez por módulo e só lidas pelos testes do
+# caminho feliz; os testes de erro continuam validando a cada chamada
+@pytest.fixture(scope="module")
+def valid_user_create():
+    return UserCreate(
+        email="test@example.com",
+        username="testuser",
+        full_name="Test User",
+        password="SecurePassword123!"
+    )
+
+
+@pytest.fixture(scope="module")
+def valid_user_login():
+    return UserLogin(username="testuser", password="SecurePassword123!")
+
+
+@pytest.fixture(scope="module")
+def valid_token():
+    return Token(access_token="eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...")
+
+
+@pytest.fixture(scope="module")
+def valid_token_data():
+    return TokenData(username="testuser", user_id=1, role=UserRole.USER)
+
+
 class TestUserCreate:
     """Testes para schema UserCreate"""
     
-    def test_user_create_valid_data(self, sample_user_data):
+    def test_user_create_valid_data(self, valid_user_create, sample_user_data):
         """Testa criação de usuário com dados válidos"""
-        user = UserCreate(**sample_user_data)
+        user = valid_user_create
         
         assert user.email == sample_user_data["email"]
         assert user.username == sample_user_data["username"]
@@ -27,17 +54,16 @@ class TestUserCreate:
     
     def test_user_create_admin_role(self, sample_user_data):
         """Testa criação de usuário com role admin"""
-        sample_user_data["role"] = UserRole.ADMIN
-        user = UserCreate(**sample_user_data)
+        user = UserCreate(**{**sample_user_data, "role": UserRole.ADMIN})
         
         assert user.role == UserRole.ADMIN
     
     def test_user_create_invalid_email(self, sample_user_data):
         """Testa criação de usuário com email inválido"""
-        sample_user_data["email"] = "invalid-email"
+        invalid_data = {**sample_user_data, "email": "invalid-email"}
         
         with pytest.raises(ValidationError) as exc_info:
-            UserCreate(**sample_user_data)
+            UserCreate(**invalid_data)
         
         assert "email" in str(exc_info.value).lower()
     
@@ -48,8 +74,8 @@ class TestUserCreate:
     
     def test_user_create_without_full_name(self, sample_user_data):
         """Testa criação de usuário sem full_name (campo opcional)"""
-        del sample_user_data["full_name"]
-        user = UserCreate(**sample_user_data)
+        data = {k: v for k, v in sample_user_data.items() if k != "full_name"}
+        user = UserCreate(**data)
         
         assert user.full_name is None
         assert user.email == sample_user_data["email"]
@@ -92,13 +118,9 @@ class TestUserUpdate:
 class TestUserLogin:
     """Testes para schema UserLogin"""
     
-    def test_user_login_valid(self):
+    def test_user_login_valid(self, valid_user_login):
         """Testa schema de login com dados válidos"""
-        login_data = {
-            "username": "testuser",
-            "password": "SecurePassword123!"
-        }
-        user_login = UserLogin(**login_data)
+        user_login = valid_user_login
         
         assert user_login.username == "testuser"
         assert user_login.password == "SecurePassword123!"
@@ -112,34 +134,22 @@ class TestUserLogin:
 class TestToken:
     """Testes para schema Token"""
     
-    def test_token_valid(self):
+    def test_token_valid(self, valid_token):
         """Testa criação de token com dados válidos"""
-        token_data = {
-            "access_token": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9...",
-            "token_type": "bearer"
-        }
-        token = Token(**token_data)
-        
-        assert token.access_token == token_data["access_token"]
-        assert token.token_type == "bearer"
+        assert valid_token.access_token == "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9..."
     
-    def test_token_default_type(self):
+    def test_token_default_type(self, valid_token):
         """Testa tipo padrão do token"""
-        token = Token(access_token="test_token")
-        
-        assert token.token_type == "bearer"
+        # valid_token é criado sem token_type
+        assert valid_token.token_type == "bearer"
 
 
 class TestTokenData:
     """Testes para schema TokenData"""
     
-    def test_token_data_complete(self):
+    def test_token_data_complete(self, valid_token_data):
         """Testa TokenData com todos os campos"""
-        token_data = TokenData(
-            username="testuser",
-            user_id=1,
-            role=UserRole.USER
-        )
+        token_data = valid_token_data
         
         assert token_data.username == "testuser"
         assert token_data.user_id == 1